@@ -1,6 +1,4 @@
-import pygame
 from pygame.sprite import Sprite
-import os
 
 
 class Alien(Sprite):
@@ -9,13 +7,22 @@ class Alien(Sprite):
         self.screen = ai_game.screen
         self.settings = ai_game.settings
 
-        self.image = pygame.image.load(os.path.join(os.path.dirname(__file__), './image/enemy_ship.bmp'))
+        # The surface is shared by every alien, see AssetManager.
+        self.image = ai_game.assets.image('enemy_ship.bmp', self.settings.alien_scale)
         self.rect = self.image.get_rect()
 
         self.rect.x = self.rect.width
         self.rect.y = self.rect.height
 
         self.x = float(self.rect.x)
+        # Position in the Fleet arrays while the alien belongs to one.
+        self.fleet_index = None
+
+    def reset(self, ai_game):
+        """Return a recycled alien to its just-constructed position."""
+        self.rect.x = self.rect.width
+        self.rect.y = self.rect.height
+        self.x = float(self.rect.x)
 
     def check_edges(self):
         screen_rect = self.screen.get_rect()
@@ -1,57 +1,111 @@
+import os
 import sys
-from time import sleep
 import pygame
 
+from assets import AssetManager
 from settings import Settings
 from game_stats import GameStats
 from ship import Ship
 from bullet import Bullet
 from alien import Alien
+from collision import groupcollide_indexed, spritecollideany_indexed
+from fleet import Fleet
+from frame_timer import NullTimer
+from pool import PooledGroup, SpritePool
+from renderer import DirtyRenderer, FlipRenderer
 
 
 class AlienInvasion:
-    def __init__(self):
+    def __init__(self, settings=None, headless=False, timer=None, render=True):
+        # Headless games use SDL's dummy video driver, so no window is opened and the
+        # loop can be stepped as fast as possible (see headless.py).
+        self.headless = headless
+        # Replays and batch runs only need the simulation, so they can skip drawing.
+        self.render = render
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
         pygame.init()
         print("Game is initialized")
         self.clock = pygame.time.Clock()
-        self.settings = Settings()
-
-        self.screen = pygame.display.set_mode((
-            self.settings.screen_width, self.settings.screen_height
-        ))
-        # self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        # self.settings.screen_width = self.screen.get_rect().width
-        # self.settings.screen_height = self.screen.get_rect().height
+        self.settings = settings or Settings()
+        self.timer = timer or NullTimer()
+        self.ticks = 0
+        # Set by replay.record() to log key events and per-tick state hashes.
+        self.recorder = None
+
+        if self.settings.fullscreen:
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            self.settings.screen_width = self.screen.get_rect().width
+            self.settings.screen_height = self.screen.get_rect().height
+        else:
+            self.screen = pygame.display.set_mode((
+                self.settings.screen_width, self.settings.screen_height
+            ))
 
         pygame.display.set_caption("Alien Invasion")
+        # Images are loaded and converted once, up front, so new waves never hit the disk.
+        self.assets = AssetManager()
+        self.assets.preload(['ship.bmp', 'enemy_ship.bmp'])
+        self.assets.image('enemy_ship.bmp', self.settings.alien_scale)
         self.stats = GameStats(self)
         self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+        # Bullets and aliens are recycled through pools rather than rebuilt per shot/wave.
+        self.bullet_pool = SpritePool(Bullet)
+        self.alien_pool = SpritePool(Alien)
+        self.bullets = PooledGroup(self.bullet_pool)
+        self.aliens = Fleet(self, pool=self.alien_pool)
         self.game_active = True
+        self.renderer = self._make_renderer()
 
         self._create_fleet()
 
     def run_game(self):
         print("Game is running")
         while True:
+            self._step()
+            self.clock.tick(60)
+
+    def _step(self):
+        """Advance the game by exactly one tick, without waiting on the clock."""
+        with self.timer.phase('events'):
             self._check_events()
 
-            if self.game_active:
+        if self.game_active and self.stats.respawn_ticks:
+            # After a hit the world stays frozen for a while, but events and drawing go on.
+            self.stats.respawn_ticks -= 1
+        elif self.game_active:
+            with self.timer.phase('ship'):
                 self.ship.update()
-                # When you call update() on a group, the group automatically calls update() for each sprite in the group.
+            # When you call update() on a group, the group automatically calls update() for each sprite in the group.
+            with self.timer.phase('bullets'):
                 self._update_bullets()
+            with self.timer.phase('collisions'):
+                self._check_bullet_alien_collisions()
+            with self.timer.phase('fleet'):
                 self._update_aliens()
+            with self.timer.phase('collisions'):
+                self._check_ship_collisions()
 
-            self._update_screen()
-            self.clock.tick(60)
+        if self.render:
+            with self.timer.phase('draw'):
+                self._update_screen()
+        self.timer.end_tick()
+
+        if self.recorder is not None:
+            self.recorder.end_tick(self)
+        self.ticks += 1
 
     def _create_fleet(self):
-        alien = Alien(self)
+        alien = self.alien_pool.acquire(self)
         alien_width, alien_height = alien.rect.size
+        self.alien_pool.release(alien)
+
+        fleet_bottom = self.settings.screen_height - 3 * alien_height
+        if self.settings.fleet_rows is not None:
+            fleet_bottom = min(fleet_bottom, (2 * self.settings.fleet_rows + 1) * alien_height)
 
         current_x, current_y = alien_width, alien_height
-        while current_y < (self.settings.screen_height - 3 * alien_height):
+        while current_y < fleet_bottom:
             while current_x < (self.settings.screen_width - 2 * alien_width):
                 self._create_alien(current_x, current_y)
                 current_x += 2 * alien_width
@@ -60,7 +114,7 @@ class AlienInvasion:
             current_y += 2 * alien_height
 
     def _create_alien(self, x_position, y_position):
-        new_alien = Alien(self)
+        new_alien = self.alien_pool.acquire(self)
         new_alien.x = x_position
         new_alien.rect.x = x_position
         new_alien.rect.y = y_position
@@ -69,16 +123,16 @@ class AlienInvasion:
     def _update_bullets(self):
         # When you call update() on a group, the group automatically calls update() for each sprite in the group.
         self.bullets.update()
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
-
-        self._check_bullet_alien_collisions()
+        # Collect first, then remove in one call: no copy of the whole group per frame.
+        gone = [bullet for bullet in self.bullets if bullet.rect.bottom <= 0]
+        if gone:
+            self.bullets.remove(*gone)
 
     def _check_bullet_alien_collisions(self):
-        pygame.sprite.groupcollide(self.bullets, self.aliens, True, True)
+        groupcollide_indexed(self.bullets, self.aliens)
 
         if not self.aliens:
+            self.stats.waves_cleared += 1
             self.bullets.empty()
             self._create_fleet()
 
@@ -86,9 +140,13 @@ class AlienInvasion:
         self._check_fleet_edges()
         self.aliens.update()
 
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
-            print("ship hit")
+    def _check_ship_collisions(self):
+        # Invulnerability only protects the ship; aliens landing still cost one.
+        if self.stats.invulnerable_ticks:
+            self.stats.invulnerable_ticks -= 1
+        elif spritecollideany_indexed(self.ship, self.aliens):
             self._ship_hit()
+            return
 
         self._check_aliens_bottom()
 
@@ -101,19 +159,20 @@ class AlienInvasion:
 
             self._create_fleet()
             self.ship.center_ship()
-            sleep(0.5)
+            self.stats.respawn_ticks = self.settings.ship_respawn_ticks
+            self.stats.invulnerable_ticks = self.settings.ship_invulnerable_ticks
         else:
             self.game_active = False
 
     def _check_aliens_bottom(self):
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= self.screen.get_rect().bottom:
-                self._ship_hit()
-                break
+        if self.aliens.reaches(self.screen.get_rect().bottom):
+            self._ship_hit()
 
     def _check_events(self):
         # This function returns a list of events that have taken place since the last time this function was called
         for event in pygame.event.get():
+            if self.recorder is not None and event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                self.recorder.record_event(self.ticks, event)
             if event.type == pygame.QUIT:
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
@@ -130,6 +189,8 @@ class AlienInvasion:
             sys.exit()
         elif event.key == pygame.K_SPACE:
             self._fire_bullet()
+        elif event.key == pygame.K_r:
+            self._toggle_renderer()
 
     def _check_keyup_events(self, event):
         if event.key == pygame.K_RIGHT:
@@ -138,30 +199,28 @@ class AlienInvasion:
             self.ship.moving_left = False
 
     def _check_fleet_edges(self):
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        if self.aliens.check_edges():
+            self._change_fleet_direction()
 
     def _change_fleet_direction(self):
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
+        self.aliens.drop(self.settings.fleet_drop_speed)
         self.settings.fleet_direction *= -1
 
     def _fire_bullet(self):
-        new_bullet = Bullet(self)
+        new_bullet = self.bullet_pool.acquire(self)
         self.bullets.add(new_bullet)
 
+    def _make_renderer(self):
+        if self.settings.dirty_rendering:
+            return DirtyRenderer(self)
+        return FlipRenderer(self)
+
+    def _toggle_renderer(self):
+        self.settings.dirty_rendering = not self.settings.dirty_rendering
+        self.renderer = self._make_renderer()
+
     def _update_screen(self):
-        self.screen.fill(self.settings.bg_color)
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        # This function draws the ship on the screen
-        self.ship.blitme()
-        self.aliens.draw(self.screen)
-
-        # This function updates the display and continuously updates the display
-        pygame.display.flip()
+        self.renderer.render()
 
 
 if __name__ == '__main__':
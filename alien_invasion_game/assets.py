@@ -0,0 +1,44 @@
+import os
+from time import perf_counter
+
+import pygame
+
+
+IMAGE_DIR = os.path.join(os.path.dirname(__file__), 'image')
+
+
+class AssetManager:
+    """Load each image once, convert it to the display format and share the surface.
+
+    Call preload() after pygame.display.set_mode(), because convert() needs the
+    display pixel format. Load times are kept in `load_times` (milliseconds).
+    """
+    def __init__(self, image_dir=IMAGE_DIR):
+        self.image_dir = image_dir
+        self.images = {}
+        self.load_times = {}
+
+    def preload(self, names):
+        for name in names:
+            self.image(name)
+
+    def image(self, name, scale=1.0):
+        """Return the shared surface for `name`, optionally scaled by `scale`."""
+        key = (name, scale)
+        if key not in self.images:
+            start = perf_counter()
+            if scale == 1.0:
+                image = self._convert(pygame.image.load(os.path.join(self.image_dir, name)))
+            else:
+                image = self._convert(pygame.transform.scale_by(self.image(name), scale))
+            self.images[key] = image
+            self.load_times[key] = (perf_counter() - start) * 1000
+        return self.images[key]
+
+    @staticmethod
+    def _convert(image):
+        if not pygame.display.get_surface():
+            return image
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
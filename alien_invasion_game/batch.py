@@ -0,0 +1,138 @@
+"""Run many headless Alien Invasion games across a process pool to balance Settings.
+
+Every combination of the swept settings is played `--runs` times by a policy, with
+no drawing and no frame limiter. Per-run outcomes are written column by column to
+an .npz file (one NumPy array per column).
+
+Example:
+    python batch.py --alien-speed 1.0 1.5 2.0 --ship-limit 1 2 3 --runs 50 --out results.npz
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+from alien_invasion import AlienInvasion
+from headless import ScriptedInput
+from settings import Settings
+
+
+SWEPT_SETTINGS = ('alien_speed', 'fleet_drop_speed', 'bullet_speed', 'ship_limit')
+COLUMNS = ('run_id', 'seed', 'policy') + SWEPT_SETTINGS + ('waves_cleared', 'ticks_survived', 'ships_lost')
+
+
+class RandomPolicy:
+    """Seeded random movement and firing, the same stream headless.py uses."""
+    def __init__(self, seed, fire_rate=0.2, turn_rate=0.05):
+        self.script = ScriptedInput(seed, fire_rate, turn_rate)
+
+    def events(self, ai_game):
+        return self.script.events_for_tick()
+
+
+class SweepPolicy:
+    """Sweep from edge to edge under the fleet, firing every `fire_every` ticks."""
+    def __init__(self, seed, fire_every=8):
+        self.fire_every = fire_every + seed % 3
+        self.key = None
+
+    def events(self, ai_game):
+        events = []
+        ship_rect, screen_rect = ai_game.ship.rect, ai_game.ship.screen_rect
+        if self.key is None or ship_rect.right >= screen_rect.right or ship_rect.left <= 0:
+            new_key = pygame.K_LEFT if self.key == pygame.K_RIGHT else pygame.K_RIGHT
+            if self.key is not None:
+                events.append(pygame.event.Event(pygame.KEYUP, key=self.key))
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=new_key))
+            self.key = new_key
+        if ai_game.ticks % self.fire_every == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        return events
+
+
+POLICIES = {'random': RandomPolicy, 'sweep': SweepPolicy}
+
+
+def play(job):
+    """Play one game to the end (or `max_ticks`) and return its result row."""
+    run_id, seed, policy_name, overrides, max_ticks = job
+    settings = Settings()
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    # Games print on start-up and on every hit, which is only noise here.
+    with contextlib.redirect_stdout(io.StringIO()):
+        ai_game = AlienInvasion(settings=settings, headless=True, render=False)
+        policy = POLICIES[policy_name](seed)
+        while ai_game.game_active and ai_game.ticks < max_ticks:
+            for event in policy.events(ai_game):
+                if event.type == pygame.KEYDOWN:
+                    ai_game._check_keydown_events(event)
+                else:
+                    ai_game._check_keyup_events(event)
+            ai_game._step()
+
+    ships_lost = settings.ship_limit - ai_game.stats.ships_left + (not ai_game.game_active)
+    return (run_id, seed, policy_name, *(overrides[name] for name in SWEPT_SETTINGS),
+            ai_game.stats.waves_cleared, ai_game.ticks, ships_lost)
+
+
+def make_jobs(sweep, runs, policy, max_ticks, seed=0):
+    """One job per run of every combination of the values in `sweep` ({name: [values]})."""
+    jobs = []
+    names = list(sweep)
+    for values in itertools.product(*(sweep[name] for name in names)):
+        for _ in range(runs):
+            run_id = len(jobs)
+            jobs.append((run_id, seed + run_id, policy, dict(zip(names, values)), max_ticks))
+    return jobs
+
+
+def run_batch(jobs, workers=None):
+    """Play all jobs across a process pool and return the results as {column: array}."""
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rows = list(executor.map(play, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    return to_columns(rows)
+
+
+def to_columns(rows):
+    """{column: array} from the result rows of play()."""
+    return {name: np.array(column) for name, column in zip(COLUMNS, zip(*rows))}
+
+
+def main():
+    defaults = Settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name in SWEPT_SETTINGS:
+        value_type = type(getattr(defaults, name))
+        parser.add_argument('--' + name.replace('_', '-'), type=value_type, nargs='+',
+                            default=[getattr(defaults, name)])
+    parser.add_argument('--runs', type=int, default=10, help='games per settings combination')
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--max-ticks', type=int, default=36_000, help='stop a game after this many ticks')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default='results.npz')
+    args = parser.parse_args()
+
+    sweep = {name: getattr(args, name) for name in SWEPT_SETTINGS}
+    jobs = make_jobs(sweep, args.runs, args.policy, args.max_ticks, args.seed)
+    start = perf_counter()
+    results = run_batch(jobs, args.workers)
+    elapsed = perf_counter() - start
+    np.savez(args.out, **results)
+
+    total_ticks = int(results['ticks_survived'].sum())
+    print(f"{len(jobs)} games, {total_ticks:,} ticks in {elapsed:.1f} s "
+          f"({total_ticks / elapsed:,.0f} ticks/s), results in {args.out}")
+
+
+if __name__ == '__main__':
+    main()
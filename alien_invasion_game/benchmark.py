@@ -0,0 +1,114 @@
+"""Frame-time benchmark for the headless game loop.
+
+Scales the fleet (through Settings.alien_scale) and the number of live bullets (through
+the scripted fire rate) and prints p50/p99 per phase, so hot-loop regressions show up as
+numbers instead of dropped frames.
+
+With --collisions it instead times one bullet/alien collision pass through the fleet
+grid against pygame.sprite.groupcollide as the number of sprites grows.
+
+Example:
+    python benchmark.py --ticks 600
+    python benchmark.py --collisions
+"""
+import argparse
+import random
+from time import perf_counter
+from types import SimpleNamespace
+
+import pygame
+
+from collision import groupcollide_indexed
+from fleet import Fleet
+from frame_timer import PHASES
+from headless import run_headless
+from settings import Settings
+
+
+ALIEN_SCALES = (1.0, 0.25, 0.1, 0.05, 0.025)
+FIRE_RATES = (0.05, 0.5, 1.0)
+# image/enemy_ship.bmp is 150x150.
+ALIEN_IMAGE_HEIGHT = 150
+
+
+def bench_settings(alien_scale):
+    """Settings for a long-running game whose fleet covers the top 40% of the screen."""
+    settings = Settings()
+    settings.alien_scale = alien_scale
+    alien_height = ALIEN_IMAGE_HEIGHT * alien_scale
+    settings.fleet_rows = max(1, int(0.4 * settings.screen_height / (2 * alien_height)))
+    # Keep the game active so every tick exercises the update path.
+    settings.ship_limit = 10 ** 6
+    return settings
+
+
+def run_benchmark(ticks=600, seed=0, alien_scales=ALIEN_SCALES, fire_rates=FIRE_RATES):
+    """Return a list of (alien_scale, fire_rate, summary) rows."""
+    rows = []
+    for alien_scale in alien_scales:
+        for fire_rate in fire_rates:
+            settings = bench_settings(alien_scale)
+            summary = run_headless(ticks, seed, settings, fire_rate).timer.summary()
+            rows.append((alien_scale, fire_rate, summary))
+    return rows
+
+
+def _collision_groups(ai_game, num_aliens, num_bullets, seed):
+    rng = random.Random(seed)
+    width, height = ai_game.screen.get_size()
+    aliens = Fleet(ai_game)
+    bullets = pygame.sprite.Group()
+    for _ in range(num_aliens):
+        alien = pygame.sprite.Sprite()
+        alien.rect = pygame.Rect(rng.randrange(width), rng.randrange(height), 8, 8)
+        aliens.add(alien)
+    for _ in range(num_bullets):
+        bullet = pygame.sprite.Sprite()
+        bullet.rect = pygame.Rect(rng.randrange(width), rng.randrange(height), 3, 15)
+        bullets.add(bullet)
+    return aliens, bullets
+
+
+def run_collision_benchmark(sizes=(250, 500, 1000, 2000, 4000, 8000), seed=0):
+    """Return (sprites, groupcollide ms, indexed ms) rows with as many bullets as aliens."""
+    settings = Settings()
+    settings.collision_cell_size = 32
+    ai_game = SimpleNamespace(settings=settings, screen=pygame.Surface((4000, 4000)))
+    rows = []
+    for size in sizes:
+        timings = []
+        for collide in (lambda b, a: pygame.sprite.groupcollide(b, a, True, True), groupcollide_indexed):
+            aliens, bullets = _collision_groups(ai_game, size, size, seed)
+            start = perf_counter()
+            collide(bullets, aliens)
+            timings.append((perf_counter() - start) * 1000)
+        rows.append((size, *timings))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--collisions', action='store_true', help='benchmark the collision index only')
+    args = parser.parse_args()
+
+    if args.collisions:
+        print(f"{'sprites':>8}{'groupcollide ms':>18}{'grid ms':>10}")
+        for size, brute_force, indexed in run_collision_benchmark(seed=args.seed):
+            print(f"{size:>8}{brute_force:>18.2f}{indexed:>10.2f}")
+        return
+
+    rows = run_benchmark(args.ticks, args.seed)
+    header = f"{'scale':>6}{'fire':>6}" + ''.join(f"{name:>22}" for name in PHASES + ('tick',))
+    print(header)
+    print(f"{'':>12}" + f"{'p50/p99 ms':>22}" * (len(PHASES) + 1))
+    for alien_scale, fire_rate, summary in rows:
+        cells = ''.join(
+            f"{summary[name]['p50']:>12.3f}/{summary[name]['p99']:<9.3f}" for name in PHASES + ('tick',)
+        )
+        print(f"{alien_scale:>6}{fire_rate:>6}{cells}")
+
+
+if __name__ == '__main__':
+    main()
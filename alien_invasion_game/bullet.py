@@ -10,8 +10,11 @@ class Bullet(Sprite):
         self.color = self.settings.bullet_color
 
         self.rect = pygame.Rect(0, 0, self.settings.bullet_width, self.settings.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
+        self.reset(ai_game)
 
+    def reset(self, ai_game):
+        """Place a (possibly recycled) bullet at the top of the ship."""
+        self.rect.midtop = ai_game.ship.rect.midtop
         self.y = float(self.rect.y)
 
     def update(self):
@@ -19,4 +22,4 @@ class Bullet(Sprite):
         self.rect.y = self.y
 
     def draw_bullet(self):
-        pygame.draw.rect(self.screen, self.color, self.rect)
+        return pygame.draw.rect(self.screen, self.color, self.rect)
@@ -0,0 +1,96 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    """Uniform grid of square cells mapping each cell to the sprites that overlap it.
+
+    Sprites are inserted, moved and removed one at a time, so the grid only changes
+    where something crossed a cell boundary. Queries return candidates from the cells a
+    rect touches; callers still do the exact rect test.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)
+        self._ranges = {}
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, item, rect):
+        cell_range = self.cell_range(rect)
+        self._ranges[item] = cell_range
+        for cell in self._cells(cell_range):
+            self.cells[cell].add(item)
+
+    def remove(self, item):
+        cell_range = self._ranges.pop(item, None)
+        if cell_range is None:
+            return
+        for cell in self._cells(cell_range):
+            bucket = self.cells[cell]
+            bucket.discard(item)
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, item, cell_range):
+        """Re-bucket `item` if it now covers a different cell range."""
+        if self._ranges.get(item) == cell_range:
+            return
+        self.remove(item)
+        self._ranges[item] = cell_range
+        for cell in self._cells(cell_range):
+            self.cells[cell].add(item)
+
+    def clear(self):
+        self.cells.clear()
+        self._ranges.clear()
+
+    def query(self, rect):
+        """Return the items sharing at least one cell with `rect`."""
+        cells = self.cells
+        found = set()
+        for cell in self._cells(self.cell_range(rect)):
+            bucket = cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    @staticmethod
+    def _cells(cell_range):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+
+def groupcollide_indexed(group, fleet):
+    """Same result as pygame.sprite.groupcollide(group, fleet, True, True), via the fleet grid.
+
+    Sprites in `group` are visited in group order and hit aliens are killed straight
+    away, so a later sprite cannot hit an alien an earlier one already destroyed.
+    """
+    crashed = {}
+    grid = fleet.grid
+    for sprite in group.sprites():
+        rect = sprite.rect
+        hits = [alien for alien in grid.query(rect) if rect.colliderect(fleet.rect_of(alien))]
+        if hits:
+            crashed[sprite] = hits
+            for alien in hits:
+                alien.kill()
+            sprite.kill()
+    return crashed
+
+
+def spritecollideany_indexed(sprite, fleet):
+    """Same result as pygame.sprite.spritecollideany(sprite, fleet), via the fleet grid."""
+    rect = sprite.rect
+    for alien in fleet.grid.query(rect):
+        if rect.colliderect(fleet.rect_of(alien)):
+            return alien
+    return None
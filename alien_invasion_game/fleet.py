@@ -0,0 +1,190 @@
+import numpy as np
+import pygame
+
+from collision import SpatialHash
+
+
+def round_half_away(values):
+    """Round like pygame.Rect does when a float is assigned to one of its coordinates."""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class Fleet(pygame.sprite.Group):
+    """A sprite group whose aliens keep their positions in contiguous NumPy arrays.
+
+    Movement, edge detection and the drop step run as vectorized operations over the
+    arrays. Each Alien sprite is only a view: its rect is written back from the arrays
+    by sync_rects(), which draw() calls, so a tick without drawing touches no sprite.
+    Collision code reads positions with rect_of() instead.
+
+    The fleet also maintains a SpatialHash of its aliens for the bullet and ship
+    collision queries; the bottom-of-screen check is reaches(), a maximum over the
+    arrays. Cell ranges are recomputed with NumPy and only aliens that crossed a cell
+    boundary are re-bucketed.
+    """
+    _columns = ('x', 'rect_x', 'y', 'width', 'height', 'alive',
+                'cell_x0', 'cell_y0', 'cell_x1', 'cell_y1')
+
+    def __init__(self, ai_game, capacity=64, pool=None):
+        super().__init__()
+        # Aliens leaving the fleet are handed back to this SpritePool, if there is one.
+        self.pool = pool
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen.get_rect()
+
+        self._count = 0
+        self._slots = []
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.rect_x = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.width = np.zeros(capacity, dtype=np.int64)
+        self.height = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.cell_x0 = np.zeros(capacity, dtype=np.int64)
+        self.cell_y0 = np.zeros(capacity, dtype=np.int64)
+        self.cell_x1 = np.zeros(capacity, dtype=np.int64)
+        self.cell_y1 = np.zeros(capacity, dtype=np.int64)
+        self.grid = None
+        self._rects_stale = False
+
+    def copy(self):
+        # Group.copy() would call Fleet(sprites); a plain group is what callers iterate.
+        self.sync_rects()
+        return pygame.sprite.Group(self.sprites())
+
+    def draw(self, surface, *args, **kwargs):
+        self.sync_rects()
+        return super().draw(surface, *args, **kwargs)
+
+    def rect_of(self, sprite):
+        """The sprite's rect as the arrays have it, whether or not sprite.rect is synced."""
+        index = sprite.fleet_index
+        return pygame.Rect(int(self.rect_x[index]), int(self.y[index]),
+                           int(self.width[index]), int(self.height[index]))
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if self._count == len(self.x):
+            self._grow()
+        index = self._count
+        self._count += 1
+        self._slots.append(sprite)
+        sprite.fleet_index = index
+
+        self.x[index] = getattr(sprite, 'x', sprite.rect.x)
+        self.rect_x[index] = sprite.rect.x
+        self.y[index] = sprite.rect.y
+        self.width[index] = sprite.rect.width
+        self.height[index] = sprite.rect.height
+        self.alive[index] = True
+
+        if self.grid is None:
+            self.grid = SpatialHash(self._cell_size(sprite.rect))
+        self.grid.insert(sprite, sprite.rect)
+        (self.cell_x0[index], self.cell_y0[index],
+         self.cell_x1[index], self.cell_y1[index]) = self.grid.cell_range(sprite.rect)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        index = sprite.fleet_index
+        self.alive[index] = False
+        self._slots[index] = None
+        sprite.fleet_index = None
+        self.grid.remove(sprite)
+        if self.pool is not None:
+            self.pool.release(sprite)
+
+        if not self.spritedict:
+            self._count = 0
+            self._slots.clear()
+        elif len(self.spritedict) * 2 < self._count:
+            self._compact()
+
+    def _cell_size(self, rect):
+        if self.settings.collision_cell_size:
+            return self.settings.collision_cell_size
+        # A few aliens per cell keeps both re-bucketing and queries cheap.
+        return max(16, 4 * max(rect.width, rect.height))
+
+    def _grow(self):
+        capacity = 2 * len(self.x)
+        for name in self._columns:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _compact(self):
+        """Drop dead slots so the vectorized passes only touch live aliens."""
+        live = np.flatnonzero(self.alive[:self._count])
+        count = len(live)
+        for name in self._columns:
+            values = getattr(self, name)
+            values[:count] = values[live]
+            values[count:self._count] = 0
+        self._slots = [self._slots[i] for i in live.tolist()]
+        for index, sprite in enumerate(self._slots):
+            sprite.fleet_index = index
+        self._count = count
+
+    def check_edges(self):
+        """Return True if any live alien touches the left or right screen edge."""
+        alive = self.alive[:self._count]
+        if not alive.any():
+            return False
+        left = self.rect_x[:self._count][alive]
+        right = left + self.width[:self._count][alive]
+        return bool(right.max() >= self.screen_rect.right or left.min() <= 0)
+
+    def drop(self, distance):
+        self.y[:self._count] += distance
+        self._rects_stale = True
+        self._rebucket()
+
+    def update(self, *args, **kwargs):
+        count = self._count
+        self.x[:count] += self.settings.alien_speed * self.settings.fleet_direction
+        self.rect_x[:count] = round_half_away(self.x[:count])
+        self._rects_stale = True
+        self._rebucket()
+
+    def reaches(self, bottom):
+        """Return True if any live alien's rect.bottom is at or below `bottom`."""
+        count = self._count
+        alive = self.alive[:count]
+        if not alive.any():
+            return False
+        return bool((self.y[:count][alive] + self.height[:count][alive]).max() >= bottom)
+
+    def _rebucket(self):
+        count = self._count
+        if not count:
+            return
+        size = self.grid.cell_size
+        x0 = self.rect_x[:count] // size
+        y0 = self.y[:count] // size
+        x1 = (self.rect_x[:count] + self.width[:count] - 1) // size
+        y1 = (self.y[:count] + self.height[:count] - 1) // size
+        changed = self.alive[:count] & ((x0 != self.cell_x0[:count]) | (y0 != self.cell_y0[:count])
+                                        | (x1 != self.cell_x1[:count]) | (y1 != self.cell_y1[:count]))
+        indices = np.flatnonzero(changed)
+        if len(indices):
+            ranges = zip(x0[indices].tolist(), y0[indices].tolist(),
+                         x1[indices].tolist(), y1[indices].tolist())
+            for index, cell_range in zip(indices.tolist(), ranges):
+                self.grid.move(self._slots[index], cell_range)
+        self.cell_x0[:count] = x0
+        self.cell_y0[:count] = y0
+        self.cell_x1[:count] = x1
+        self.cell_y1[:count] = y1
+
+    def sync_rects(self):
+        """Copy the array positions into the sprites' rects, if they moved since the last sync."""
+        if not self._rects_stale:
+            return
+        self._rects_stale = False
+        xs = self.rect_x[:self._count].tolist()
+        ys = self.y[:self._count].tolist()
+        for sprite, x, y in zip(self._slots, xs, ys):
+            if sprite is not None:
+                sprite.rect.topleft = (x, y)
@@ -0,0 +1,64 @@
+import math
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+
+PHASES = ('events', 'ship', 'bullets', 'collisions', 'fleet', 'draw')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+class FrameTimer:
+    """Accumulate per-phase wall time for each tick of the game loop."""
+    def __init__(self, phases=PHASES):
+        self.phases = phases
+        self.samples = {name: [] for name in phases}
+        self.samples['tick'] = []
+        self._current = dict.fromkeys(phases, 0.0)
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            # A phase may be entered several times in one tick, so accumulate.
+            self._current[name] += perf_counter() - start
+
+    def end_tick(self):
+        total = 0.0
+        for name in self.phases:
+            self.samples[name].append(self._current[name])
+            total += self._current[name]
+            self._current[name] = 0.0
+        self.samples['tick'].append(total)
+
+    def summary(self):
+        """Return {phase: {'p50': ms, 'p99': ms, 'mean': ms}} over all recorded ticks."""
+        result = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            mean = sum(ordered) / len(ordered) if ordered else 0.0
+            result[name] = {
+                'p50': percentile(ordered, 50) * 1000,
+                'p99': percentile(ordered, 99) * 1000,
+                'mean': mean * 1000,
+            }
+        return result
+
+
+class NullTimer:
+    """Drop-in timer for the interactive game, where nobody reads the numbers."""
+    _context = nullcontext()
+
+    def phase(self, name):
+        return self._context
+
+    def end_tick(self):
+        pass
@@ -8,3 +8,7 @@ class GameStats:
 
     def reset_stats(self):
         self.ships_left = self.settings.ship_limit
+        self.waves_cleared = 0
+        # Countdowns started by a ship hit, advanced once per tick.
+        self.respawn_ticks = 0
+        self.invulnerable_ticks = 0
@@ -0,0 +1,93 @@
+"""Step Alien Invasion without a window or frame limiter and report per-phase timings.
+
+Example:
+    python headless.py --ticks 3000 --seed 7 --fire-rate 0.5
+"""
+import argparse
+import gc
+import random
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from frame_timer import FrameTimer, PHASES
+from settings import Settings
+
+
+class ScriptedInput:
+    """Seeded stream of key presses, posted to the pygame event queue one tick at a time."""
+    def __init__(self, seed=0, fire_rate=0.2, turn_rate=0.05):
+        self.random = random.Random(seed)
+        self.fire_rate = fire_rate
+        self.turn_rate = turn_rate
+        self.held_key = None
+
+    def events_for_tick(self):
+        events = []
+        if self.random.random() < self.turn_rate:
+            # Release the current direction and either stop or move the other way.
+            if self.held_key is not None:
+                events.append(pygame.event.Event(pygame.KEYUP, key=self.held_key))
+            self.held_key = self.random.choice([pygame.K_LEFT, pygame.K_RIGHT, None])
+            if self.held_key is not None:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=self.held_key))
+        if self.random.random() < self.fire_rate:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+            events.append(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+        return events
+
+    def post(self):
+        for event in self.events_for_tick():
+            pygame.event.post(event)
+
+
+def run_headless(ticks=1000, seed=0, settings=None, fire_rate=0.2, turn_rate=0.05):
+    """Run a headless game for `ticks` ticks and return it; ai_game.timer holds the timings."""
+    ai_game = AlienInvasion(settings=settings, headless=True, timer=FrameTimer())
+    scripted_input = ScriptedInput(seed, fire_rate, turn_rate)
+    for _ in range(ticks):
+        scripted_input.post()
+        ai_game._step()
+    return ai_game
+
+
+def gc_collections():
+    return sum(generation['collections'] for generation in gc.get_stats())
+
+
+def format_summary(summary):
+    lines = [f"{'phase':<12}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}"]
+    for name in PHASES + ('tick',):
+        row = summary[name]
+        lines.append(f"{name:<12}{row['p50']:>10.3f}{row['p99']:>10.3f}{row['mean']:>10.3f}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fire-rate', type=float, default=0.2, help='chance of firing on each tick')
+    parser.add_argument('--alien-scale', type=float, default=1.0)
+    parser.add_argument('--dirty', action='store_true', help='use the dirty-rectangle renderer')
+    args = parser.parse_args()
+
+    settings = Settings()
+    settings.alien_scale = args.alien_scale
+    settings.dirty_rendering = args.dirty
+    collections_before = gc_collections()
+    ai_game = run_headless(args.ticks, args.seed, settings, args.fire_rate)
+    print(format_summary(ai_game.timer.summary()))
+    renderer = ai_game.renderer
+    if renderer.frames:
+        print(f"{renderer.name} renderer: {renderer.total_rect_area / renderer.frames:,.0f} px of rect area "
+              f"updated per frame")
+    print(f"gc collections: {gc_collections() - collections_before}")
+    print(f"bullet pool: {ai_game.bullet_pool.stats()}")
+    print(f"alien pool: {ai_game.alien_pool.stats()}")
+    for (name, scale), load_ms in ai_game.assets.load_times.items():
+        print(f"loaded {name} x{scale}: {load_ms:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import pygame
+
+
+class SpritePool:
+    """Hand out recycled sprites instead of constructing a new one each time.
+
+    `factory(*args)` builds a sprite when the pool is empty; a recycled sprite is
+    re-initialised with `sprite.reset(*args)` instead. The counters show how often
+    each path is taken.
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.allocations = 0
+        self.hits = 0
+        self.live = 0
+        self.peak_live = 0
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.hits += 1
+        else:
+            sprite = self.factory(*args)
+            self.allocations += 1
+        self.live += 1
+        self.peak_live = max(self.peak_live, self.live)
+        return sprite
+
+    def release(self, sprite):
+        self.free.append(sprite)
+        self.live -= 1
+
+    def stats(self):
+        return {
+            'allocations': self.allocations,
+            'pool_hits': self.hits,
+            'live': self.live,
+            'peak_live': self.peak_live,
+            'free': len(self.free),
+        }
+
+
+class PooledGroup(pygame.sprite.Group):
+    """A sprite group that returns sprites to their pool when they leave the group."""
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+
+    def copy(self):
+        return pygame.sprite.Group(self.sprites())
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.pool.release(sprite)
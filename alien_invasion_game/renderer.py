@@ -0,0 +1,76 @@
+import pygame
+
+
+def draw_sprites(ai_game):
+    """Draw bullets, ship and aliens in game order; return the rects that were drawn."""
+    rects = [bullet.draw_bullet() for bullet in ai_game.bullets.sprites()]
+    # This function draws the ship on the screen
+    rects.append(ai_game.ship.blitme())
+    ai_game.aliens.draw(ai_game.screen)
+    rects.extend(ai_game.aliens.spritedict.values())
+    return rects
+
+
+class FlipRenderer:
+    """Repaint the whole screen and present it with display.flip() every frame."""
+    name = 'flip'
+
+    def __init__(self, ai_game):
+        self.ai_game = ai_game
+        self.frames = 0
+        # Area of the rects handed to the display; overlapping rects count twice.
+        self.rect_area = 0
+        self.total_rect_area = 0
+
+    def render(self):
+        screen = self.ai_game.screen
+        screen.fill(self.ai_game.settings.bg_color)
+        draw_sprites(self.ai_game)
+        # This function updates the display and continuously updates the display
+        pygame.display.flip()
+        self._count(screen.get_width() * screen.get_height())
+
+    def _count(self, area):
+        self.frames += 1
+        self.rect_area = area
+        self.total_rect_area += area
+
+
+class DirtyRenderer(FlipRenderer):
+    """Erase last frame's sprite rects, redraw the sprites and present only those regions.
+
+    The background is a flat colour, so erasing is a fill of each old rect. When the
+    dirty area would cover the whole screen anyway, the frame is flipped instead.
+    """
+    name = 'dirty'
+
+    def __init__(self, ai_game):
+        super().__init__(ai_game)
+        # None makes the next frame a full repaint, e.g. right after switching renderers.
+        self._previous = None
+
+    def render(self):
+        screen = self.ai_game.screen
+        bg_color = self.ai_game.settings.bg_color
+        screen_area = screen.get_width() * screen.get_height()
+
+        if self._previous is None:
+            screen.fill(bg_color)
+            self._previous = draw_sprites(self.ai_game)
+            pygame.display.flip()
+            self._count(screen_area)
+            return
+
+        for rect in self._previous:
+            screen.fill(bg_color, rect)
+        current = draw_sprites(self.ai_game)
+        dirty = self._previous + current
+        self._previous = current
+
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area >= screen_area:
+            pygame.display.flip()
+            self._count(screen_area)
+        else:
+            pygame.display.update(dirty)
+            self._count(area)
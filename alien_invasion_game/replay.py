@@ -0,0 +1,163 @@
+"""Record the key presses of a game session and replay them at full speed.
+
+A recording is a small binary file: a header with the screen size and the Settings
+the game started with, followed by fixed-size records of (tick, kind, value). Kinds are KEYDOWN,
+KEYUP and TICK_HASH, a CRC32 of the game state at the end of each tick. Replay
+feeds the keys back through _check_keydown_events/_check_keyup_events without
+drawing or waiting on the clock, and checks every tick hash along the way.
+
+Example:
+    python replay.py record session.airp
+    python replay.py play session.airp --timings
+"""
+import argparse
+import json
+import struct
+import zlib
+from collections import defaultdict
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from frame_timer import FrameTimer
+from headless import format_summary
+from settings import Settings
+
+
+MAGIC = b'AIRP'
+VERSION = 2
+HEADER = struct.Struct('<4sHIHH')
+RECORD = struct.Struct('<IBI')
+
+KEYDOWN, KEYUP, TICK_HASH = 0, 1, 2
+
+
+class ReplayMismatch(Exception):
+    """The replayed game diverged from the recorded one."""
+
+
+def state_hash(ai_game):
+    """CRC32 of everything the simulation carries from one tick to the next."""
+    fleet = ai_game.aliens
+    count = fleet._count
+    crc = zlib.crc32(struct.pack(
+        '<dii?iiid', ai_game.ship.x, ai_game.ship.rect.x, ai_game.stats.ships_left,
+        ai_game.game_active, ai_game.stats.respawn_ticks, ai_game.stats.invulnerable_ticks,
+        len(fleet), ai_game.settings.fleet_direction,
+    ))
+    for column in (fleet.x, fleet.y, fleet.alive):
+        crc = zlib.crc32(column[:count].tobytes(), crc)
+    bullets = [value for bullet in ai_game.bullets for value in (bullet.y, bullet.rect.x)]
+    crc = zlib.crc32(struct.pack(f'<{len(bullets)}d', *bullets), crc)
+    return crc
+
+
+def settings_to_json(settings):
+    return json.dumps(vars(settings), sort_keys=True).encode()
+
+
+def settings_from_json(data):
+    settings = Settings()
+    for name, value in json.loads(data).items():
+        setattr(settings, name, tuple(value) if isinstance(value, list) else value)
+    return settings
+
+
+class Recorder:
+    """Write the key events and per-tick state hashes of one game to `path`."""
+    def __init__(self, path, settings):
+        self.file = open(path, 'wb')
+        settings_json = settings_to_json(settings)
+        # A fullscreen game's size comes from the display, so it is stored rather than asked for again.
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(settings_json), settings.screen_width,
+                                    settings.screen_height))
+        self.file.write(settings_json)
+
+    def record_event(self, tick, event):
+        kind = KEYDOWN if event.type == pygame.KEYDOWN else KEYUP
+        self.file.write(RECORD.pack(tick, kind, event.key))
+
+    def end_tick(self, ai_game):
+        self.file.write(RECORD.pack(ai_game.ticks, TICK_HASH, state_hash(ai_game)))
+
+    def close(self):
+        self.file.close()
+
+
+def load(path):
+    """Return (settings, {tick: [(kind, value), ...]}) for a recording."""
+    with open(path, 'rb') as file:
+        magic, version, settings_length, width, height = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an Alien Invasion recording (version {VERSION})")
+        settings = settings_from_json(file.read(settings_length))
+        settings.fullscreen = False
+        settings.screen_width, settings.screen_height = width, height
+        ticks = defaultdict(list)
+        for tick, kind, value in RECORD.iter_unpack(file.read()):
+            ticks[tick].append((kind, value))
+    return settings, ticks
+
+
+def replay(path, verify=True, timer=None):
+    """Replay a recording as fast as possible and return the finished game.
+
+    Raises ReplayMismatch at the first tick whose state hash differs from the recording.
+    """
+    settings, ticks = load(path)
+    ai_game = AlienInvasion(settings=settings, headless=True, timer=timer, render=False)
+    if ai_game.screen.get_size() != (settings.screen_width, settings.screen_height):
+        raise ReplayMismatch(f"recorded at {settings.screen_width}x{settings.screen_height}, "
+                             f"but the screen is {ai_game.screen.get_size()}")
+    last_tick = max(ticks, default=-1)
+    while ai_game.ticks <= last_tick:
+        tick = ai_game.ticks
+        expected_hash = None
+        for kind, value in ticks.get(tick, ()):
+            if kind == KEYDOWN and value == pygame.K_q:
+                # The session was quit here, before this tick was stepped.
+                return ai_game
+            if kind == KEYDOWN:
+                ai_game._check_keydown_events(pygame.event.Event(pygame.KEYDOWN, key=value))
+            elif kind == KEYUP:
+                ai_game._check_keyup_events(pygame.event.Event(pygame.KEYUP, key=value))
+            else:
+                expected_hash = value
+        ai_game._step()
+        if verify and expected_hash is not None and state_hash(ai_game) != expected_hash:
+            raise ReplayMismatch(f"state diverged from the recording at tick {tick}")
+    return ai_game
+
+
+def record(path, settings=None):
+    """Play the game interactively and record the session to `path`."""
+    settings = settings or Settings()
+    ai_game = AlienInvasion(settings=settings)
+    ai_game.recorder = Recorder(path, settings)
+    try:
+        ai_game.run_game()
+    finally:
+        ai_game.recorder.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=['record', 'play'])
+    parser.add_argument('path')
+    parser.add_argument('--no-verify', action='store_true', help='skip the per-tick state hash check')
+    parser.add_argument('--timings', action='store_true', help='print per-phase frame timings')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.path)
+        return
+
+    timer = FrameTimer() if args.timings else None
+    ai_game = replay(args.path, verify=not args.no_verify, timer=timer)
+    print(f"replayed {ai_game.ticks} ticks, ships left: {ai_game.stats.ships_left}")
+    if timer:
+        print(format_summary(timer.summary()))
+
+
+if __name__ == '__main__':
+    main()
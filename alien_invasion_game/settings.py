@@ -6,6 +6,13 @@ class Settings:
         self.bg_color = (230, 230, 230)
         self.ship_speed = 1.5
         self.ship_limit = 2
+        # Ship-hit recovery, counted in ticks (60 per second): the world freezes for
+        # ship_respawn_ticks, then the new ship ignores aliens for ship_invulnerable_ticks.
+        self.ship_respawn_ticks = 30
+        self.ship_invulnerable_ticks = 60
+        self.fullscreen = False
+        # Redraw and present only the changed regions; toggle in game with 'r'.
+        self.dirty_rendering = False
 
         # Bullet settings
         self.bullet_speed = 2.0
@@ -18,3 +25,9 @@ class Settings:
         self.fleet_drop_speed = 10
         # fleet_direction of 1 represents right; -1 represents left.
         self.fleet_direction = 1
+        # Scale factor applied to the alien image; smaller aliens mean a larger fleet.
+        self.alien_scale = 1.0
+        # Maximum number of alien rows; None fills the screen down to the ship.
+        self.fleet_rows = None
+        # Cell size of the alien collision grid; None picks one from the alien size.
+        self.collision_cell_size = None
@@ -1,6 +1,3 @@
-import pygame
-import os
-
 
 class Ship:
     def __init__(self, ai_game):
@@ -8,7 +5,7 @@ class Ship:
         self.screen_rect = ai_game.screen.get_rect()
         self.settings = ai_game.settings
 
-        self.image = pygame.image.load(os.path.join(os.path.dirname(__file__), './image/ship.bmp'))
+        self.image = ai_game.assets.image('ship.bmp')
         self.rect = self.image.get_rect()
 
         self.rect.midbottom = self.screen_rect.midbottom
@@ -27,7 +24,7 @@ class Ship:
         self.rect.x = self.x
 
     def blitme(self):
-        self.screen.blit(self.image, self.rect)
+        return self.screen.blit(self.image, self.rect)
 
     def center_ship(self):
         self.rect.midbottom = self.screen_rect.midbottom
@@ -0,0 +1,29 @@
+import unittest
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+
+class AssetManagerTest(unittest.TestCase):
+    def test_images_are_loaded_once_and_shared(self):
+        settings = Settings()
+        settings.alien_scale = 0.5
+        ai_game = AlienInvasion(settings=settings, headless=True, render=False)
+        assets = ai_game.assets
+        self.assertEqual(set(assets.load_times), {('ship.bmp', 1.0), ('enemy_ship.bmp', 1.0), ('enemy_ship.bmp', 0.5)})
+
+        aliens = ai_game.aliens.sprites()
+        self.assertGreater(len(aliens), 1)
+        self.assertTrue(all(alien.image is assets.image('enemy_ship.bmp', 0.5) for alien in aliens))
+        self.assertIs(ai_game.ship.image, assets.image('ship.bmp'))
+        full_size = assets.image('enemy_ship.bmp').get_size()
+        self.assertEqual(aliens[0].image.get_size(), (full_size[0] // 2, full_size[1] // 2))
+
+        # A new wave takes the cached surfaces; nothing more is loaded.
+        ai_game.aliens.empty()
+        ai_game._create_fleet()
+        self.assertEqual(len(assets.load_times), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
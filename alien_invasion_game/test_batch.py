@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from batch import COLUMNS, SWEPT_SETTINGS, make_jobs, play, to_columns
+
+
+class MakeJobsTest(unittest.TestCase):
+    def test_every_combination_is_run_with_its_own_seed(self):
+        sweep = {'alien_speed': [1.0, 2.0], 'fleet_drop_speed': [10], 'bullet_speed': [2.5, 5.0],
+                 'ship_limit': [3]}
+        jobs = make_jobs(sweep, runs=3, policy='sweep', max_ticks=100, seed=7)
+
+        self.assertEqual(len(jobs), 12)
+        self.assertEqual([job[0] for job in jobs], list(range(12)))
+        self.assertEqual([job[1] for job in jobs], list(range(7, 19)))
+        combinations = {tuple(job[3][name] for name in SWEPT_SETTINGS) for job in jobs}
+        self.assertEqual(combinations, {(1.0, 10, 2.5, 3), (1.0, 10, 5.0, 3), (2.0, 10, 2.5, 3), (2.0, 10, 5.0, 3)})
+        self.assertEqual(jobs[0][2:], ('sweep', {'alien_speed': 1.0, 'fleet_drop_speed': 10, 'bullet_speed': 2.5,
+                                                 'ship_limit': 3}, 100))
+
+
+class PlayTest(unittest.TestCase):
+    MAX_TICKS = 400
+
+    def setUp(self):
+        # Fast, steep fleets, so the games end within MAX_TICKS.
+        sweep = {'alien_speed': [8.0], 'fleet_drop_speed': [200], 'bullet_speed': [2.5], 'ship_limit': [1]}
+        self.jobs = make_jobs(sweep, runs=2, policy='random', max_ticks=self.MAX_TICKS)
+
+    def test_same_seed_gives_the_same_game(self):
+        first, again = play(self.jobs[1]), play(self.jobs[1])
+        self.assertEqual(first, again)
+        self.assertNotEqual(play(self.jobs[0])[-2], first[-2])
+
+    def test_results_are_saved_column_by_column(self):
+        results = to_columns([play(job) for job in self.jobs])
+        handle, path = tempfile.mkstemp(suffix='.npz')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        np.savez(path, **results)
+
+        with np.load(path) as saved:
+            self.assertEqual(sorted(saved.files), sorted(COLUMNS))
+            self.assertEqual(saved['run_id'].tolist(), [0, 1])
+            self.assertEqual(saved['seed'].tolist(), [0, 1])
+            self.assertEqual(saved['policy'].tolist(), ['random', 'random'])
+            self.assertEqual(saved['ship_limit'].tolist(), [1, 1])
+            self.assertTrue((saved['ticks_survived'] < self.MAX_TICKS).all())
+            # Every ship was lost, and then the game.
+            self.assertEqual(saved['ships_lost'].tolist(), [2, 2])
+            self.assertTrue((saved['waves_cleared'] >= 0).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
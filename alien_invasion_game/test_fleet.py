@@ -0,0 +1,90 @@
+import random
+import unittest
+from types import SimpleNamespace
+
+import pygame
+
+from collision import groupcollide_indexed, spritecollideany_indexed
+from fleet import Fleet
+from settings import Settings
+
+
+def make_fleet(rects):
+    ai_game = SimpleNamespace(settings=Settings(), screen=pygame.Surface((1200, 800)))
+    fleet = Fleet(ai_game)
+    for rect in rects:
+        alien = pygame.sprite.Sprite()
+        alien.rect = pygame.Rect(rect)
+        fleet.add(alien)
+    return fleet
+
+
+class ReachesTest(unittest.TestCase):
+    def test_alien_far_past_the_bottom_is_found(self):
+        fleet = make_fleet([(100, 50, 40, 40), (300, 50, 40, 40)])
+        self.assertFalse(fleet.reaches(800))
+        # Far more than one drop step in a single call.
+        fleet.drop(5000)
+        self.assertTrue(fleet.reaches(800))
+
+    def test_dead_aliens_are_ignored(self):
+        fleet = make_fleet([(100, 50, 40, 40), (300, 790, 40, 40)])
+        self.assertTrue(fleet.reaches(800))
+        fleet.sprites()[1].kill()
+        self.assertFalse(fleet.reaches(800))
+
+
+class CollisionTest(unittest.TestCase):
+    """The grid collisions on a moved fleet give what pygame's brute-force versions give."""
+    TICKS, DROP = 7, 23
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.alien_rects = [(rng.randrange(1100), rng.randrange(700), 20, 20) for _ in range(400)]
+        self.bullet_rects = [(rng.randrange(1200), rng.randrange(800), 3, 15) for _ in range(400)]
+        self.fleet = make_fleet(self.alien_rects)
+        self.fleet.settings.collision_cell_size = 32
+        for _ in range(self.TICKS):
+            self.fleet.update()
+        self.fleet.drop(self.DROP)
+        # Where the aliens are now, built without the Fleet.
+        self.moved = [pygame.Rect(x + self.TICKS, y + self.DROP, w, h) for x, y, w, h in self.alien_rects]
+
+    def sprites(self, rects):
+        sprites = []
+        for index, rect in enumerate(rects):
+            sprite = pygame.sprite.Sprite()
+            sprite.rect, sprite.index = pygame.Rect(rect), index
+            sprites.append(sprite)
+        return sprites
+
+    def test_groupcollide_matches_pygame(self):
+        for index, alien in enumerate(self.fleet.sprites()):
+            alien.index = index
+        expected = pygame.sprite.groupcollide(pygame.sprite.Group(self.sprites(self.bullet_rects)),
+                                              pygame.sprite.Group(self.sprites(self.moved)), True, True)
+        found = groupcollide_indexed(pygame.sprite.Group(self.sprites(self.bullet_rects)), self.fleet)
+
+        def by_index(crashed):
+            return {bullet.index: sorted(alien.index for alien in aliens) for bullet, aliens in crashed.items()}
+        self.assertTrue(expected)
+        self.assertEqual(by_index(found), by_index(expected))
+        self.assertEqual(len(self.fleet), len(self.moved) - sum(map(len, expected.values())))
+
+    def test_spritecollideany_matches_pygame(self):
+        reference = pygame.sprite.Group(self.sprites(self.moved))
+        for ship in self.sprites(self.bullet_rects):
+            ship.rect.size = (60, 48)
+            self.assertEqual(spritecollideany_indexed(ship, self.fleet) is None,
+                             pygame.sprite.spritecollideany(ship, reference) is None)
+
+    def test_draw_syncs_the_rects(self):
+        self.assertNotEqual(self.fleet.sprites()[0].rect, self.moved[0])
+        for alien in self.fleet.sprites():
+            alien.image = pygame.Surface(alien.rect.size)
+        self.fleet.draw(pygame.Surface((1200, 800)))
+        self.assertEqual([alien.rect for alien in self.fleet.sprites()], self.moved)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from frame_timer import PHASES, FrameTimer, percentile
+from headless import format_summary, run_headless
+
+
+class FrameTimerTest(unittest.TestCase):
+    def test_phases_entered_twice_add_up_within_a_tick(self):
+        timer = FrameTimer(phases=('a', 'b'))
+        for name in ('a', 'b', 'a'):
+            with timer.phase(name):
+                pass
+        timer.end_tick()
+        timer.end_tick()
+
+        self.assertEqual([len(values) for values in timer.samples.values()], [2, 2, 2])
+        self.assertAlmostEqual(timer.samples['tick'][0], timer.samples['a'][0] + timer.samples['b'][0])
+        self.assertEqual(timer.samples['tick'][1], 0.0)
+
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class RunHeadlessTest(unittest.TestCase):
+    TICKS = 30
+
+    def test_every_phase_is_timed_on_every_tick(self):
+        ai_game = run_headless(self.TICKS, seed=1, fire_rate=0.5)
+        summary = ai_game.timer.summary()
+
+        self.assertEqual(ai_game.ticks, self.TICKS)
+        self.assertEqual(set(summary), set(PHASES) | {'tick'})
+        for name, values in ai_game.timer.samples.items():
+            self.assertEqual(len(values), self.TICKS, name)
+        report = format_summary(summary)
+        for name in PHASES + ('tick',):
+            self.assertGreater(summary[name]['mean'], 0, name)
+            self.assertIn(name, report)
+
+
+if __name__ == '__main__':
+    unittest.main()
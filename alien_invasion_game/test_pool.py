@@ -0,0 +1,88 @@
+import unittest
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from collision import groupcollide_indexed
+from pool import PooledGroup, SpritePool
+
+
+class Token(pygame.sprite.Sprite):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+    def reset(self, value):
+        self.value = value
+
+
+class SpritePoolTest(unittest.TestCase):
+    def test_released_sprites_are_reset_and_reused(self):
+        pool = SpritePool(Token)
+        first, second = pool.acquire(1), pool.acquire(2)
+        pool.release(first)
+        again = pool.acquire(3)
+
+        self.assertIs(again, first)
+        self.assertEqual(again.value, 3)
+        self.assertIsNot(second, first)
+        self.assertEqual(pool.stats(), {'allocations': 2, 'pool_hits': 1, 'live': 2, 'peak_live': 2, 'free': 0})
+
+    def test_peak_live_survives_releases(self):
+        pool = SpritePool(Token)
+        tokens = [pool.acquire(value) for value in range(5)]
+        for token in tokens:
+            pool.release(token)
+        pool.acquire(0)
+        self.assertEqual(pool.stats(), {'allocations': 5, 'pool_hits': 1, 'live': 1, 'peak_live': 5, 'free': 4})
+
+
+class PooledGroupTest(unittest.TestCase):
+    def test_leaving_the_group_releases_once(self):
+        pool = SpritePool(Token)
+        group = PooledGroup(pool)
+        token = pool.acquire(1)
+        group.add(token)
+
+        token.kill()
+        token.kill()
+        group.remove(token)
+
+        self.assertEqual(pool.free, [token])
+        self.assertEqual(pool.stats()['live'], 0)
+
+    def test_empty_releases_every_sprite(self):
+        pool = SpritePool(Token)
+        group = PooledGroup(pool)
+        group.add(*[pool.acquire(value) for value in range(3)])
+        group.empty()
+        self.assertEqual(pool.stats()['free'], 3)
+        self.assertEqual(pool.stats()['live'], 0)
+
+
+class CollisionReleaseTest(unittest.TestCase):
+    def test_groupcollide_releases_each_hit_sprite_once(self):
+        game = AlienInvasion(headless=True, render=False)
+        target = game.aliens.sprites()[0]
+        for _ in range(2):
+            game._fire_bullet()
+        # Both bullets overlap the same alien; only the first one reaches it.
+        for bullet in game.bullets:
+            bullet.rect.center = game.aliens.rect_of(target).center
+        first, second = game.bullets.sprites()
+        bullets, aliens = game.bullet_pool.stats(), game.alien_pool.stats()
+
+        crashed = groupcollide_indexed(game.bullets, game.aliens)
+        first.kill()
+        target.kill()
+
+        self.assertEqual(crashed, {first: [target]})
+        self.assertEqual(game.bullets.sprites(), [second])
+        self.assertEqual(game.bullet_pool.free, [first])
+        self.assertEqual(game.alien_pool.free, [target])
+        self.assertEqual(game.bullet_pool.stats()['live'], bullets['live'] - 1)
+        self.assertEqual(game.alien_pool.stats()['live'], aliens['live'] - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
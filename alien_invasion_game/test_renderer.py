@@ -0,0 +1,39 @@
+import unittest
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from headless import ScriptedInput
+from renderer import draw_sprites
+from settings import Settings
+
+
+class DirtyRendererTest(unittest.TestCase):
+    def test_screen_matches_a_full_repaint(self):
+        settings = Settings()
+        settings.dirty_rendering = True
+        settings.alien_scale = 0.3
+        ai_game = AlienInvasion(settings=settings, headless=True)
+        scripted_input = ScriptedInput(seed=2, fire_rate=0.5)
+        for _ in range(400):
+            scripted_input.post()
+            ai_game._step()
+        self.assertEqual(ai_game.renderer.name, 'dirty')
+        self.assertLess(ai_game.renderer.rect_area, ai_game.screen.get_width() * ai_game.screen.get_height())
+
+        dirty = pygame.image.tobytes(ai_game.screen, 'RGB')
+        ai_game.screen.fill(settings.bg_color)
+        draw_sprites(ai_game)
+        self.assertEqual(dirty, pygame.image.tobytes(ai_game.screen, 'RGB'))
+
+    def test_toggling_repaints_the_whole_screen(self):
+        ai_game = AlienInvasion(headless=True)
+        ai_game._step()
+        ai_game._toggle_renderer()
+        ai_game._step()
+        screen = ai_game.screen
+        self.assertEqual(ai_game.renderer.rect_area, screen.get_width() * screen.get_height())
+
+
+if __name__ == '__main__':
+    unittest.main()
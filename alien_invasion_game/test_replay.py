@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from headless import ScriptedInput
+from replay import HEADER, RECORD, TICK_HASH, Recorder, ReplayMismatch, replay, state_hash
+from settings import Settings
+
+
+class ReplayRoundTripTest(unittest.TestCase):
+    TICKS = 600
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.airp')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        settings = Settings()
+        settings.alien_speed = 3.0
+        self.game = AlienInvasion(settings=settings, headless=True, render=False)
+        self.game.recorder = Recorder(self.path, settings)
+        scripted_input = ScriptedInput(seed=5, fire_rate=0.5)
+        for _ in range(self.TICKS):
+            scripted_input.post()
+            self.game._step()
+        self.game.recorder.close()
+
+    def test_replay_reaches_the_recorded_state(self):
+        replayed = replay(self.path)
+        self.assertEqual(replayed.ticks, self.TICKS)
+        self.assertEqual(state_hash(replayed), state_hash(self.game))
+        self.assertEqual(replayed.settings.alien_speed, 3.0)
+
+    def test_changed_hash_is_reported(self):
+        with open(self.path, 'rb') as file:
+            data = bytearray(file.read())
+        settings_length = HEADER.unpack_from(data)[2]
+        offset = HEADER.size + settings_length
+        while True:
+            tick, kind, value = RECORD.unpack_from(data, offset)
+            if kind == TICK_HASH and tick == 300:
+                break
+            offset += RECORD.size
+        RECORD.pack_into(data, offset, tick, kind, value ^ 1)
+        with open(self.path, 'wb') as file:
+            file.write(data)
+
+        with self.assertRaisesRegex(ReplayMismatch, 'tick 300'):
+            replay(self.path)
+        self.assertEqual(replay(self.path, verify=False).ticks, self.TICKS)
+
+
+class ReplayEndsTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.airp')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def test_session_quit_with_q_replays_up_to_the_quit(self):
+        game = AlienInvasion(headless=True, render=False)
+        game.recorder = Recorder(self.path, game.settings)
+        for _ in range(50):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+            game._step()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_q))
+        with self.assertRaises(SystemExit):
+            game._step()
+        game.recorder.close()
+
+        replayed = replay(self.path)
+        self.assertEqual(replayed.ticks, 50)
+        self.assertEqual(state_hash(replayed), state_hash(game))
+
+    def test_fullscreen_recording_replays_at_its_recorded_size(self):
+        settings = Settings()
+        settings.fullscreen = True
+        settings.screen_width, settings.screen_height = 1000, 700
+        Recorder(self.path, settings).close()
+        replayed = replay(self.path)
+        self.assertEqual(replayed.screen.get_size(), (1000, 700))
+
+
+if __name__ == '__main__':
+    unittest.main()
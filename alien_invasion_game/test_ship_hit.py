@@ -0,0 +1,31 @@
+import unittest
+
+from alien_invasion import AlienInvasion
+from vec_env import NOOP, VecAlienInvasion
+
+
+class AliensLandingWhileInvulnerableTest(unittest.TestCase):
+    def test_game_counts_the_landing(self):
+        ai_game = AlienInvasion(headless=True, render=False)
+        ai_game.stats.invulnerable_ticks = 10
+        ai_game.aliens.drop(ai_game.settings.screen_height)
+
+        ai_game._check_ship_collisions()
+
+        self.assertEqual(ai_game.stats.ships_left, ai_game.settings.ship_limit - 1)
+        self.assertEqual(ai_game.stats.invulnerable_ticks, ai_game.settings.ship_invulnerable_ticks)
+
+    def test_vec_env_counts_the_landing(self):
+        env = VecAlienInvasion(2)
+        env.reset()
+        env.invulnerable_ticks[:] = 10
+        env.fleet_y[0] = env.settings.screen_height
+
+        env.step([NOOP, NOOP])
+
+        self.assertEqual(env.ships_left.tolist(), [env.settings.ship_limit - 1, env.settings.ship_limit])
+        self.assertEqual(env.invulnerable_ticks.tolist(), [env.settings.ship_invulnerable_ticks, 9])
+
+
+if __name__ == '__main__':
+    unittest.main()
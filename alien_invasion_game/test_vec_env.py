@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+from vec_env import FIRE, LEFT, LEFT_FIRE, NUM_ACTIONS, RIGHT, RIGHT_FIRE, VecAlienInvasion
+
+
+class MatchesAlienInvasionTest(unittest.TestCase):
+    def test_seeded_run_matches_the_game_tick_for_tick(self):
+        settings = Settings()
+        settings.alien_speed = 4.0
+        settings.fleet_drop_speed = 200
+        game = AlienInvasion(settings=settings, headless=True, render=False)
+        env = VecAlienInvasion(1, settings=settings)
+        env.reset()
+        rng = np.random.default_rng(1)
+        # Long presses, so the ship actually travels.
+        actions = np.repeat(rng.integers(NUM_ACTIONS, size=150), 20)
+
+        shot_down = hits = 0
+        for tick, action in enumerate(actions):
+            game.ship.moving_left = action in (LEFT, LEFT_FIRE)
+            game.ship.moving_right = action in (RIGHT, RIGHT_FIRE)
+            if action >= FIRE and env.bullet_alive[0].sum() < env.max_bullets:
+                game._fire_bullet()
+            ships_before = game.stats.ships_left
+            game._step()
+            _, rewards, dones = env.step([action])
+
+            if dones[0]:
+                break
+            hits += game.stats.ships_left < ships_before
+            shot_down += rewards[0]
+            self.assertEqual(env.ship_x[0], game.ship.x, f'tick {tick}')
+            self.assertEqual(env.ships_left[0], game.stats.ships_left, f'tick {tick}')
+            self.assertEqual(env.alien_alive[0].sum(), len(game.aliens), f'tick {tick}')
+            self.assertEqual(env.fleet_direction[0], settings.fleet_direction, f'tick {tick}')
+        self.assertTrue(dones[0])
+        self.assertFalse(game.game_active)
+        self.assertGreater(shot_down, 0)
+        self.assertEqual(hits, settings.ship_limit)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+from statistics import median
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from learning_logs import views
+from learning_logs.models import Topic, Entry
+from learning_logs.pagination import PAGE_SIZE, encode_token
+
+
+class Command(BaseCommand):
+    help = ("Time the topic page for topics with more and more entries, at the first page, "
+            "the middle and the last. Nothing is kept: the data is rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'entries':>10}{'first ms':>10}{'middle ms':>11}{'last ms':>10}{'OFFSET query ms':>18}")
+        with transaction.atomic():
+            user = User.objects.create_user('page_latency')
+            for count in options['entries']:
+                self.stdout.write(self.measure(user, count, options['repeat']))
+            transaction.set_rollback(True)
+
+    def measure(self, user, count, repeat):
+        topic = Topic.objects.create(text=f'{count} entries', owner=user)
+        Entry.objects.bulk_create((Entry(topic=topic, text=f'Entry {i}') for i in range(count)), batch_size=5_000)
+        ordered = topic.entry_set.order_by('-date_added', '-id')
+        tokens = {
+            'first': None,
+            'middle': encode_token(ordered[count // 2]),
+            'last': encode_token(ordered[max(count - PAGE_SIZE - 1, 0)]),
+        }
+        timings = [self.median_ms(lambda: self.get_topic(user, topic, token), repeat) for token in tokens.values()]
+        # What the same page costs when the database has to skip the rows before it.
+        offset = self.median_ms(lambda: list(ordered[count // 2:count // 2 + PAGE_SIZE]), repeat)
+        first, middle, last = timings
+        return f"{count:>10,}{first:>10.2f}{middle:>11.2f}{last:>10.2f}{offset:>18.2f}"
+
+    def get_topic(self, user, topic, token):
+        request = RequestFactory().get('/', {'after': token} if token else {})
+        request.user = user
+        return views.topic(request, topic.id)
+
+    @staticmethod
+    def median_ms(call, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            call()
+            timings.append((perf_counter() - start) * 1000)
+        return median(timings)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning_logs', '0003_topic_owner'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['topic', '-date_added', '-id'], name='entry_topic_date_added_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(fields=['owner', 'date_added', 'id'], name='topic_owner_date_added_idx'),
+        ),
+    ]
@@ -8,6 +8,10 @@ class Topic(models.Model):
     date_added = models.DateTimeField(auto_now_add=True)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
 
+    class Meta:
+        # Serves the owner's topics page by page, in the order keyset_page() reads them.
+        indexes = [models.Index(fields=['owner', 'date_added', 'id'], name='topic_owner_date_added_idx')]
+
     def __str__(self):
         return self.text
 
@@ -19,6 +23,8 @@ class Entry(models.Model):
 
     class Meta:
         verbose_name_plural = 'entries'
+        # A topic's entries, newest first: each page is a seek and a short scan of this index.
+        indexes = [models.Index(fields=['topic', '-date_added', '-id'], name='entry_topic_date_added_idx')]
 
     def __str__(self):
         return f"{self.text[:50]}"
@@ -1,3 +1,67 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Topic, Entry
+from .pagination import after_token, encode_token, keyset_page
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='secret')
+        cls.topic = Topic.objects.create(text='Chess', owner=cls.user)
+        Entry.objects.bulk_create(Entry(topic=cls.topic, text=f'Entry {i}') for i in range(60))
+        # Pairs of entries share a date_added, so pages must break ties by id.
+        start = timezone.now() - timedelta(days=1)
+        for i, entry in enumerate(Entry.objects.order_by('id')):
+            Entry.objects.filter(id=entry.id).update(date_added=start + timedelta(minutes=i // 2))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_pages_cover_every_entry_once_newest_first(self):
+        expected = list(Entry.objects.order_by('-date_added', '-id').values_list('id', flat=True))
+        seen, token = [], None
+        while True:
+            response = self.client.get(reverse('learning_logs:topic', args=[self.topic.id]),
+                                       {'after': token} if token else {})
+            seen += [entry.id for entry in response.context['entries']]
+            token = response.context['next_page']
+            if token is None:
+                break
+        self.assertEqual(seen, expected)
+
+    def test_new_entries_do_not_shift_the_next_page(self):
+        before = list(self.topic.entry_set.order_by('-date_added', '-id'))
+        _, token = keyset_page(self.topic.entry_set.all(), newest_first=True)
+        Entry.objects.create(topic=self.topic, text='Newest')
+        second, _ = keyset_page(self.topic.entry_set.all(), token, newest_first=True)
+        self.assertEqual(second, before[25:50])
+
+    def test_topics_page_shows_only_own_topics_in_order(self):
+        other = User.objects.create_user('bob', password='secret')
+        Topic.objects.create(text='Bob topic', owner=other)
+        topics = [Topic.objects.create(text=f'Topic {i}', owner=self.user) for i in range(30)]
+        response = self.client.get(reverse('learning_logs:topics'))
+        self.assertEqual(list(response.context['topics']), [self.topic, *topics][:25])
+        response = self.client.get(reverse('learning_logs:topics'), {'after': response.context['next_page']})
+        self.assertEqual(list(response.context['topics']), topics[24:])
+        self.assertIsNone(response.context['next_page'])
+
+    def test_invalid_token_is_not_found(self):
+        response = self.client.get(reverse('learning_logs:topic', args=[self.topic.id]), {'after': 'garbage'})
+        self.assertEqual(response.status_code, 404)
 
-# Create your tests here.
+    def test_page_query_reads_the_index_in_order(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('reads the SQLite query plan')
+        entry = self.topic.entry_set.order_by('-date_added', '-id')[30]
+        plan = after_token(self.topic.entry_set.all(), encode_token(entry), newest_first=True)[:26].explain()
+        # A seek on the index, not a scan from the topic's newest entry.
+        self.assertIn('entry_topic_date_added_idx (topic_id=? AND date_added<', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -3,6 +3,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import Http404
 from .models import Topic, Entry
 from .forms import TopicForm, EntryForm
+from .pagination import keyset_page
 
 
 # Create your views here.
@@ -13,8 +14,8 @@ def index(request):
 
 @login_required
 def topics(request):
-    topics = Topic.objects.filter(owner=request.user).order_by('date_added')
-    context = {'topics': topics}
+    topics, next_page = keyset_page(Topic.objects.filter(owner=request.user), request.GET.get('after'))
+    context = {'topics': topics, 'next_page': next_page}
     return render(request, 'learning_logs/topics.html', context)
 
 
@@ -23,8 +24,8 @@ def topic(request, topic_id):
     topic = Topic.objects.get(id=topic_id)
     if topic.owner != request.user:
         raise Http404
-    entries = topic.entry_set.order_by('-date_added')
-    context = {'topic': topic, 'entries': entries}
+    entries, next_page = keyset_page(topic.entry_set.all(), request.GET.get('after'), newest_first=True)
+    context = {'topic': topic, 'entries': entries, 'next_page': next_page}
     return render(request, 'learning_logs/topic.html', context)
 
 
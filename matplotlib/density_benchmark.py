@@ -0,0 +1,68 @@
+"""Time scatter against density-raster drawing of random walks of growing length.
+
+Example:
+    python density_benchmark.py --max-points 100000000
+"""
+import argparse
+from time import perf_counter
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from density_raster import draw_density
+from random_walk import RandomWalk
+from walk_stats import WalkStats
+
+
+def draw_seconds(fig):
+    start = perf_counter()
+    fig.canvas.draw()
+    return perf_counter() - start
+
+
+def scatter_seconds(rw):
+    rw.fill_walk()
+    fig, ax = plt.subplots(figsize=(15, 9))
+    ax.scatter(rw.x_values, rw.y_values, c=range(rw.num_points), cmap=plt.cm.Blues, edgecolors='none', s=15)
+    elapsed = draw_seconds(fig)
+    plt.close(fig)
+    return elapsed
+
+
+def raster_seconds(rw, bins):
+    stats = WalkStats(bins=bins)
+    start = perf_counter()
+    for x_values, y_values in rw.iter_chunks():
+        stats.update(x_values, y_values)
+    binning = perf_counter() - start
+
+    fig, ax = plt.subplots(figsize=(15, 9))
+    draw_density(ax, stats.image('first_visit'), stats.extent(), cmap=plt.cm.Blues)
+    ax.set_xlim(stats.x_min, stats.x_max)
+    ax.set_ylim(stats.y_min, stats.y_max)
+    elapsed = draw_seconds(fig)
+    plt.close(fig)
+    return binning, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-points', type=int, default=10_000_000)
+    parser.add_argument('--max-scatter-points', type=int, default=1_000_000, help='skip scatter above this')
+    parser.add_argument('--bins', type=int, default=512)
+    args = parser.parse_args()
+
+    print(f"{'points':>12}{'scatter draw s':>16}{'raster bin s':>14}{'raster draw s':>15}")
+    num_points = 10_000
+    while num_points <= args.max_points:
+        scatter_cell = f"{'-':>16}"
+        if num_points <= args.max_scatter_points:
+            scatter_cell = f"{scatter_seconds(RandomWalk(num_points, seed=0)):>16.3f}"
+        binning, drawing = raster_seconds(RandomWalk(num_points, seed=0), args.bins)
+        print(f"{num_points:>12,}{scatter_cell}{binning:>14.3f}{drawing:>15.3f}")
+        num_points *= 10
+
+
+if __name__ == '__main__':
+    main()
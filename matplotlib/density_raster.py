@@ -0,0 +1,65 @@
+import numpy as np
+
+# Above this many points, draw a density raster instead of one marker per point.
+SCATTER_LIMIT = 100_000
+
+# First-visit value of a cell no point has landed in yet.
+UNVISITED = np.iinfo(np.int64).max
+
+
+def first_visits(first_visit, cells, start, positions=None):
+    """Record point `start + i` (or `start + positions[i]`) in the flat `first_visit` grid at new `cells[i]`."""
+    new = np.flatnonzero(first_visit[cells] == UNVISITED)
+    if len(new):
+        new_cells, first = np.unique(cells[new], return_index=True)
+        first = new[first]
+        first_visit[new_cells] = start + (first if positions is None else positions[first])
+
+
+class DensityRaster:
+    """A fixed-size 2D histogram of points over a known extent, with each cell's first point."""
+    def __init__(self, extent, width=800, height=600):
+        self.extent = tuple(extent)
+        self.width = width
+        self.height = height
+        self.counts = np.zeros((height, width), dtype=np.int64)
+        self.first_visit = np.full((height, width), UNVISITED, dtype=np.int64)
+        self.count = 0
+
+    def add(self, x_values, y_values):
+        """Bin one chunk of points; points outside the extent are counted but not drawn."""
+        left, right, bottom, top = self.extent
+        x_values = np.asarray(x_values, dtype=np.float64)
+        y_values = np.asarray(y_values, dtype=np.float64)
+        columns = np.floor((x_values - left) * (self.width / (right - left))).astype(np.int64)
+        rows = np.floor((y_values - bottom) * (self.height / (top - bottom))).astype(np.int64)
+        # The right and top edges belong to the last cell, like in np.histogram2d.
+        columns[x_values == right] = self.width - 1
+        rows[y_values == top] = self.height - 1
+
+        inside = np.flatnonzero((columns >= 0) & (columns < self.width) & (rows >= 0) & (rows < self.height))
+        cells = rows[inside] * self.width + columns[inside]
+        self.counts += np.bincount(cells, minlength=self.width * self.height).reshape(self.height, self.width)
+
+        first_visits(self.first_visit.reshape(-1), cells, self.count, positions=inside)
+        self.count += len(x_values)
+
+    def image(self, color_by='count'):
+        return density_image(self.counts, self.first_visit, color_by)
+
+
+def density_image(counts, first_visit, color_by='count'):
+    """The grid to draw, 'count' or 'first_visit', with cells nobody visited masked out."""
+    if color_by == 'count':
+        return np.ma.masked_equal(counts, 0)
+    if color_by == 'first_visit':
+        return np.ma.masked_equal(first_visit, UNVISITED)
+    raise ValueError(f"color_by must be 'count' or 'first_visit', not {color_by!r}")
+
+
+def draw_density(ax, image, extent, cmap=None, log=False):
+    """Draw a density_image with imshow; masked cells stay blank."""
+    from matplotlib.colors import LogNorm
+
+    return ax.imshow(image, extent=extent, origin='lower', cmap=cmap, norm=LogNorm() if log else None,
+                     interpolation='nearest', aspect='auto')
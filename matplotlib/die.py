@@ -1,5 +1,7 @@
+import argparse
 from random import randint
-import plotly.express as px
+
+import numpy as np
 
 
 class Die:
@@ -10,24 +12,60 @@ class Die:
         return randint(1, self.num_sides)
 
 
-die_1 = Die()
-die_2 = Die()
+class Dice:
+    """Throw any mix of dice many times at once with NumPy and tally the totals."""
+    def __init__(self, dice, seed=None):
+        self.dice = list(dice)
+        self.rng = np.random.default_rng(seed)
+        self.min_total = len(self.dice)
+        self.max_total = sum(die.num_sides for die in self.dice)
+        self.outcomes = range(self.min_total, self.max_total + 1)
+        self._dtype = np.int16 if self.max_total <= np.iinfo(np.int16).max else np.int32
+
+    def roll(self, throws, chunk_size=1_000_000):
+        """Return how often each total in self.outcomes came up in `throws` throws."""
+        frequencies = np.zeros(len(self.outcomes), dtype=np.int64)
+        for start in range(0, throws, chunk_size):
+            size = min(chunk_size, throws - start)
+            # Faces count from 0, so a throw's sum is its total's offset from min_total.
+            offsets = np.zeros(size, dtype=self._dtype)
+            for die in self.dice:
+                offsets += self.rng.integers(0, die.num_sides, size=size, dtype=self._dtype)
+            frequencies += np.bincount(offsets, minlength=len(self.outcomes))
+        return frequencies
+
+    def distribution(self):
+        """Exact probability of each total, by convolving the dice's uniform distributions."""
+        probabilities = np.ones(1)
+        for die in self.dice:
+            probabilities = np.convolve(probabilities, np.full(die.num_sides, 1 / die.num_sides))
+        return probabilities
+
+
+def main():
+    # Imported here so `import die` stays cheap for code that only rolls dice.
+    import plotly.express as px
+
+    parser = argparse.ArgumentParser(description="Roll dice and plot how often each total comes up.")
+    parser.add_argument('--sides', type=int, nargs='+', default=[6, 6], help='sides of each die in a throw')
+    parser.add_argument('--rolls', type=int, default=10_000)
+    parser.add_argument('--exact', action='store_true', help='compare with the exact distribution')
+    args = parser.parse_args()
+
+    dice = Dice(Die(num_sides) for num_sides in args.sides)
+    frequencies = dice.roll(args.rolls)
+    print(frequencies.tolist())
 
-results = []
-for roll_num in range(10000):
-    result = die_1.roll() + die_2.roll()
-    results.append(result)
+    names = ' + '.join(f"D{num_sides}" for num_sides in args.sides)
+    labels = {'x': 'Result', 'y': 'Frequency of Result'}
+    fig = px.bar(x=dice.outcomes, y=frequencies, title=f'Results of rolling {names} {args.rolls:,} times', labels=labels)
+    if args.exact:
+        expected = dice.distribution() * args.rolls
+        print(f"largest deviation from the exact distribution: {np.abs(frequencies - expected).max() / args.rolls:.6f}")
+        fig.add_scatter(x=list(dice.outcomes), y=expected, mode='lines+markers', name='Exact')
+    fig.update_layout(xaxis_dtick=1)
+    fig.show()
 
-print(results)
-frequencies = []
-max_result = die_1.num_sides + die_2.num_sides
-poss_results = range(2, max_result + 1)
-for value in poss_results:
-    frequency = results.count(value)
-    frequencies.append(frequency)
 
-print(frequencies)
-labels = {'x': 'Result', 'y': 'Frequency of Result'}
-fig = px.bar(x=poss_results, y=frequencies, title='Results of rolling one D6 100 times', labels=labels)
-fig.update_layout(xaxis_dtick=1)
-fig.show()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Render random walks or dice experiments to image files, with no display needed.
+
+Examples:
+    python export_figures.py --count 16 --format png --format svg walks --points 1000000
+    python export_figures.py --count 16 dice --rolls 10000 --sides 6 6
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from density_raster import SCATTER_LIMIT, draw_density
+from die import Dice, Die
+from random_walk import RandomWalk
+from walk_stats import WalkStats
+
+STAGES = ('simulate', 'draw', 'save')
+
+# The frame this worker process draws every job into, built on its first job.
+_frame = None
+
+
+class WalkFrame:
+    """A walk figure whose artists are given the next walk's data."""
+    def __init__(self, num_points):
+        plt.style.use('classic')
+        self.fig, self.ax = plt.subplots(figsize=(15, 9))
+        self.raster = num_points > SCATTER_LIMIT
+        self.image = None
+        self.points = None
+        if not self.raster:
+            self.points = self.ax.scatter([], [], c=[], cmap=plt.cm.Blues, edgecolors='none', s=15)
+        self.ax.scatter(0, 0, c='green', edgecolors='none', s=100)
+        self.end = self.ax.scatter(0, 0, c='red', edgecolors='none', s=100)
+        self.ax.set_aspect('equal')
+        self.ax.get_xaxis().set_visible(False)
+        self.ax.get_yaxis().set_visible(False)
+
+    def draw(self, stats):
+        if self.raster:
+            image = stats.image('first_visit')
+            if self.image is None:
+                self.image = draw_density(self.ax, image, stats.extent(), cmap=plt.cm.Blues)
+            else:
+                self.image.set_data(image)
+                self.image.set_extent(stats.extent())
+                self.image.autoscale()
+        else:
+            self.points.set_offsets(np.column_stack([stats.trace_x, stats.trace_y]))
+            self.points.set_array(stats.trace_index)
+            self.points.autoscale()
+        self.end.set_offsets([[stats.last_x, stats.last_y]])
+
+        margin = max(stats.x_max - stats.x_min, stats.y_max - stats.y_min, 1) * 0.05
+        self.ax.set_xlim(stats.x_min - margin, stats.x_max + margin)
+        self.ax.set_ylim(stats.y_min - margin, stats.y_max + margin)
+
+
+class DiceFrame:
+    """A bar chart of dice totals whose bar heights are set for each experiment."""
+    def __init__(self, sides, rolls):
+        self.fig, self.ax = plt.subplots()
+        outcomes = range(len(sides), sum(sides) + 1)
+        self.bars = self.ax.bar(outcomes, np.zeros(len(outcomes)))
+        self.ax.set_xticks(outcomes)
+        dice = ' + '.join(f"D{num_sides}" for num_sides in sides)
+        self.ax.set_title(f"Results of rolling {dice} {rolls:,} times")
+        self.ax.set_xlabel('Result')
+        self.ax.set_ylabel('Frequency of Result')
+
+    def draw(self, frequencies):
+        for bar, frequency in zip(self.bars, frequencies):
+            bar.set_height(frequency)
+        self.ax.set_ylim(0, max(frequencies) * 1.05 or 1)
+
+
+def simulate_walk(num_points, seed):
+    stats = WalkStats()
+    for x_values, y_values in RandomWalk(num_points, seed=seed).iter_chunks():
+        stats.update(x_values, y_values)
+    return stats
+
+
+def simulate_dice(sides, rolls, seed):
+    """Roll the dice `rolls` times and return how often each total came up."""
+    return Dice((Die(num_sides) for num_sides in sides), seed=seed).roll(rolls)
+
+
+def make_frame(job):
+    if job['kind'] == 'walks':
+        return WalkFrame(job['points'])
+    return DiceFrame(job['sides'], job['rolls'])
+
+
+def run_job(job):
+    """Simulate, draw and save one figure; return its paths and stage timings."""
+    global _frame
+    if _frame is None:
+        _frame = make_frame(job)
+    timings = {}
+
+    start = perf_counter()
+    if job['kind'] == 'walks':
+        data = simulate_walk(job['points'], job['seed'])
+    else:
+        data = simulate_dice(job['sides'], job['rolls'], job['seed'])
+    timings['simulate'] = perf_counter() - start
+
+    start = perf_counter()
+    _frame.draw(data)
+    timings['draw'] = perf_counter() - start
+
+    start = perf_counter()
+    paths = []
+    for file_format in job['formats']:
+        path = Path(job['out']) / f"{job['kind']}_{job['index']:04d}.{file_format}"
+        _frame.fig.savefig(path, bbox_inches='tight')
+        paths.append(str(path))
+    timings['save'] = perf_counter() - start
+    return paths, timings
+
+
+def make_jobs(args):
+    jobs = []
+    for index in range(args.count):
+        job = {'kind': args.kind, 'index': index, 'seed': args.seed + index,
+               'out': args.out, 'formats': args.format}
+        if args.kind == 'walks':
+            job['points'] = args.points
+        else:
+            job['sides'] = args.sides
+            job['rolls'] = args.rolls
+        jobs.append(job)
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=8, help='number of figures to render')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first figure; the rest count up')
+    parser.add_argument('--out', default='figures')
+    parser.add_argument('--format', action='append', choices=('png', 'svg'),
+                        help='repeat for several formats (default: png)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    kinds = parser.add_subparsers(dest='kind', required=True)
+    walks = kinds.add_parser('walks')
+    walks.add_argument('--points', type=int, default=10_000)
+    dice = kinds.add_parser('dice')
+    dice.add_argument('--sides', type=int, nargs='+', default=[6, 6])
+    dice.add_argument('--rolls', type=int, default=10_000)
+    args = parser.parse_args()
+    args.format = args.format or ['png']
+
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+    jobs = make_jobs(args)
+    start = perf_counter()
+    totals = dict.fromkeys(STAGES, 0.0)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for paths, timings in executor.map(run_job, jobs):
+            for stage in STAGES:
+                totals[stage] += timings[stage]
+            stages = '  '.join(f"{stage} {timings[stage]:.3f}s" for stage in STAGES)
+            print(f"{', '.join(paths)}: {stages}")
+    elapsed = perf_counter() - start
+
+    stages = '  '.join(f"{stage} {totals[stage]:.3f}s" for stage in STAGES)
+    print(f"{len(jobs)} figures in {elapsed:.3f}s with {args.workers} workers; total {stages}")
+
+
+if __name__ == '__main__':
+    main()
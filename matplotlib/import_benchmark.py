@@ -0,0 +1,46 @@
+"""Measure what importing each plotting module costs, using python -X importtime.
+
+Example:
+    python import_benchmark.py --repeat 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ('random_walk', 'walk_stats', 'density_raster', 'die', 'mpl_squares')
+# For scale: what the deferred imports would cost if they happened at import time.
+REFERENCES = ('numpy', 'matplotlib.pyplot', 'plotly.express')
+HEAVY = ('matplotlib.pyplot', 'plotly.express')
+
+
+def import_time(module):
+    """Return (cumulative microseconds, imported module names) for one fresh import."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported[name.strip()] = int(cumulative)
+    return imported[module], set(imported)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='imports per module; the median is shown')
+    args = parser.parse_args()
+
+    print(f"{'module':>20}{'import ms':>12}  heavy imports")
+    for module in MODULES + REFERENCES:
+        times = []
+        for _ in range(args.repeat):
+            cumulative, imported = import_time(module)
+            times.append(cumulative)
+        heavy = ', '.join(name for name in HEAVY if name in imported and name != module) or '-'
+        print(f"{module:>20}{statistics.median(times) / 1000:>12.1f}  {heavy}")
+
+
+if __name__ == '__main__':
+    main()
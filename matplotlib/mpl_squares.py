@@ -1,21 +1,46 @@
-import matplotlib.pyplot as plt
-
-plt.style.use('seaborn-v0_8')
-fig, ax = plt.subplots()
-# input_values = [1, 2, 3, 4, 5]
-# squares = [1, 4, 9, 16, 25]
-# ax.plot(input_values, squares, linewidth=3)
-x_values = range(1, 1001)
-y_values = [x**2 for x in x_values]
-ax.scatter(x_values, y_values, c=y_values, cmap=plt.cm.Blues, s=10)
-ax.axis([0, 1100, 0, 1100000])
-ax.ticklabel_format(style='plain', axis='both')
-
-ax.set_title("Square Numbers", fontsize=24)
-ax.set_xlabel("Value", fontsize=14)
-ax.set_ylabel("Square of Value", fontsize=14)
-
-ax.tick_params(labelsize=14)
-
-plt.show()
-# plt.savefig('', bbox_inches='tight')
+import argparse
+
+import numpy as np
+
+from density_raster import SCATTER_LIMIT, DensityRaster, draw_density
+
+
+def main():
+    import matplotlib.pyplot as plt
+
+    parser = argparse.ArgumentParser(description="Plot the squares of 1..points.")
+    parser.add_argument('--points', type=int, default=1000)
+    args = parser.parse_args()
+
+    plt.style.use('seaborn-v0_8')
+    fig, ax = plt.subplots()
+    # input_values = [1, 2, 3, 4, 5]
+    # squares = [1, 4, 9, 16, 25]
+    # ax.plot(input_values, squares, linewidth=3)
+    axis = [0, args.points * 11 // 10, 0, args.points**2 * 11 // 10]
+    if args.points <= SCATTER_LIMIT:
+        x_values = range(1, args.points + 1)
+        y_values = [x**2 for x in x_values]
+        ax.scatter(x_values, y_values, c=y_values, cmap=plt.cm.Blues, s=10)
+    else:
+        # Too many markers to draw one by one: bin the curve a million points at a time.
+        raster = DensityRaster(axis)
+        for start in range(1, args.points + 1, 1_000_000):
+            x_values = np.arange(start, min(start + 1_000_000, args.points + 1), dtype=np.float64)
+            raster.add(x_values, x_values**2)
+        draw_density(ax, raster.image(), axis, cmap=plt.cm.Blues, log=True)
+    ax.axis(axis)
+    ax.ticklabel_format(style='plain', axis='both')
+
+    ax.set_title("Square Numbers", fontsize=24)
+    ax.set_xlabel("Value", fontsize=14)
+    ax.set_ylabel("Square of Value", fontsize=14)
+
+    ax.tick_params(labelsize=14)
+
+    plt.show()
+    # plt.savefig('', bbox_inches='tight')
+
+
+if __name__ == '__main__':
+    main()
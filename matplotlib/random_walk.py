@@ -1,49 +1,124 @@
-from random import choice
-import matplotlib.pyplot as plt
+import argparse
+
+import numpy as np
+
+from density_raster import SCATTER_LIMIT, draw_density
+from walk_stats import WalkStats
+
 
 class RandomWalk:
-    def __init__(self, num_points=5000):
+    def __init__(self, num_points=5000, seed=None):
         self.num_points = num_points
-        self.x_values = [0]
-        self.y_values = [0]
+        self.rng = np.random.default_rng(seed)
+        self.x_values = np.zeros(1, dtype=np.int32)
+        self.y_values = np.zeros(1, dtype=np.int32)
 
     def fill_walk(self):
-        while len(self.x_values) < self.num_points:
-            x_direction = choice([1, -1])
-            x_distance = choice([0, 1, 2, 3, 4])
-            x_step = x_direction * x_distance
+        """Draw every step at once and build the coordinates with cumsum.
+
+        Each step is direction (1 or -1) times distance (0-4) on both axes, and
+        steps that go nowhere are rejected, just like one random.choice at a time.
+        """
+        dtype = self.dtype()
+        x_steps, y_steps = self._draw_steps(self.num_points - 1)
+        self.x_values = np.zeros(self.num_points, dtype=dtype)
+        self.y_values = np.zeros(self.num_points, dtype=dtype)
+        np.cumsum(x_steps, dtype=dtype, out=self.x_values[1:])
+        np.cumsum(y_steps, dtype=dtype, out=self.y_values[1:])
+
+    def dtype(self):
+        # Coordinates stay within 4 * num_points of the origin.
+        return np.int32 if 4 * self.num_points < np.iinfo(np.int32).max else np.int64
+
+    def iter_chunks(self, chunk_size=1_000_000):
+        """Yield the walk as (x_values, y_values) chunks of at most chunk_size points."""
+        dtype = self.dtype()
+        last_x = last_y = 0
+        done = 0
+        while done < self.num_points:
+            size = min(chunk_size, self.num_points - done)
+            start = 1 if done == 0 else 0
+            x_steps, y_steps = self._draw_steps(size - start)
+            x_values = np.zeros(size, dtype=dtype)
+            y_values = np.zeros(size, dtype=dtype)
+            np.cumsum(x_steps, dtype=dtype, out=x_values[start:])
+            np.cumsum(y_steps, dtype=dtype, out=y_values[start:])
+            x_values += last_x
+            y_values += last_y
+            last_x, last_y = x_values[-1], y_values[-1]
+            done += size
+            yield x_values, y_values
+
+    def write_npy(self, path, chunk_size=1_000_000, stats=None):
+        """Stream the walk into a memory-mapped (num_points, 2) .npy file, updating `stats` if given."""
+        walk = np.lib.format.open_memmap(path, mode='w+', dtype=self.dtype(), shape=(self.num_points, 2))
+        start = 0
+        for x_values, y_values in self.iter_chunks(chunk_size):
+            end = start + len(x_values)
+            walk[start:end, 0] = x_values
+            walk[start:end, 1] = y_values
+            if stats is not None:
+                stats.update(x_values, y_values)
+            start = end
+        walk.flush()
+        return walk
+
+    def _draw_steps(self, num_steps):
+        x_steps = np.empty(0, dtype=np.int8)
+        y_steps = np.empty(0, dtype=np.int8)
+        while len(x_steps) < num_steps:
+            # 1 in 25 draws is a (0, 0) step, so draw a little extra and drop those.
+            batch = int((num_steps - len(x_steps)) * 1.05) + 16
+            x_batch = self._draw_axis(batch)
+            y_batch = self._draw_axis(batch)
+            moved = (x_batch != 0) | (y_batch != 0)
+            x_steps = np.concatenate([x_steps, x_batch[moved]])
+            y_steps = np.concatenate([y_steps, y_batch[moved]])
+        return x_steps[:num_steps], y_steps[:num_steps]
+
+    def _draw_axis(self, size):
+        direction = self.rng.integers(0, 2, size=size, dtype=np.int8) * 2 - 1
+        distance = self.rng.integers(0, 5, size=size, dtype=np.int8)
+        return direction * distance
 
-            y_direction = choice([1, -1])
-            y_distance = choice([0, 1, 2, 3, 4])
-            y_step = y_direction * y_distance
 
-            if x_step == 0 and y_step == 0:
-                continue
+def main():
+    # pyplot is only needed to show walks, and importing it costs more than the rest of this module.
+    import matplotlib.pyplot as plt
 
-            x = self.x_values[-1] + x_step
-            y = self.y_values[-1] + y_step
+    parser = argparse.ArgumentParser(description="Plot random walks until told to stop.")
+    parser.add_argument('--points', type=int, default=10_000)
+    args = parser.parse_args()
 
-            self.x_values.append(x)
-            self.y_values.append(y)
+    while True:
+        rw = RandomWalk(args.points)
+        # Plot a downsampled trace, so long walks never have to be held in memory.
+        stats = WalkStats()
+        for x_values, y_values in rw.iter_chunks():
+            stats.update(x_values, y_values)
 
+        plt.style.use('classic')
+        fig, ax = plt.subplots(figsize=(15, 9))
+        if rw.num_points <= SCATTER_LIMIT:
+            ax.scatter(stats.trace_x, stats.trace_y, c=stats.trace_index, cmap=plt.cm.Blues, edgecolors='none', s=15)
+        else:
+            # One marker per point stops being drawable; color each cell by when the walk first got there.
+            draw_density(ax, stats.image('first_visit'), stats.extent(), cmap=plt.cm.Blues)
+            ax.set_xlim(stats.x_min, stats.x_max)
+            ax.set_ylim(stats.y_min, stats.y_max)
+        ax.set_aspect('equal')
+        ax.scatter(0, 0, c='green', edgecolors='none', s=100)
+        ax.scatter(stats.last_x, stats.last_y, c='red', edgecolors='none', s=100)
 
-while True:
-    rw = RandomWalk(10_000)
-    rw.fill_walk()
+        # remove the axes
+        ax.get_xaxis().set_visible(False)
+        ax.get_yaxis().set_visible(False)
+        plt.show()
 
-    plt.style.use('classic')
-    fig, ax = plt.subplots(figsize=(15, 9))
-    point_numbers = range(rw.num_points)
-    ax.scatter(rw.x_values, rw.y_values, c=point_numbers, cmap=plt.cm.Blues, edgecolors='none', s=15)
-    ax.set_aspect('equal')
-    ax.scatter(0, 0, c='green', edgecolors='none', s=100)
-    ax.scatter(rw.x_values[-1], rw.y_values[-1], c='red', edgecolors='none', s=100)
+        keep_running = input("Make another walk? y/n")
+        if keep_running == 'n':
+            break
 
-    # remove the axes
-    ax.get_xaxis().set_visible(False)
-    ax.get_yaxis().set_visible(False)
-    plt.show()
 
-    keep_running = input("Make another walk? y/n")
-    if keep_running == 'n':
-        break
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import unittest
+from collections import Counter
+from itertools import product
+
+import numpy as np
+
+from die import Dice, Die
+
+
+class DiceTest(unittest.TestCase):
+    def test_roll_tallies_every_throw(self):
+        sides = (6, 10, 4)
+        dice = Dice((Die(num_sides) for num_sides in sides), seed=7)
+        frequencies = dice.roll(2_500, chunk_size=1_000)
+
+        # The same draws, one throw at a time.
+        rng = np.random.default_rng(7)
+        totals = Counter()
+        for size in (1_000, 1_000, 500):
+            faces = [rng.integers(0, num_sides, size=size, dtype=np.int16) + 1 for num_sides in sides]
+            totals.update(sum(throw) for throw in zip(*(face.tolist() for face in faces)))
+        self.assertEqual(dict(zip(dice.outcomes, frequencies.tolist())),
+                         {total: totals[total] for total in dice.outcomes})
+        self.assertEqual(frequencies.sum(), 2_500)
+
+    def test_distribution_matches_enumeration(self):
+        sides = (6, 6, 3)
+        dice = Dice(Die(num_sides) for num_sides in sides)
+        throws = Counter(map(sum, product(*(range(1, num_sides + 1) for num_sides in sides))))
+        expected = [throws[total] / np.prod(sides) for total in dice.outcomes]
+        np.testing.assert_allclose(dice.distribution(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
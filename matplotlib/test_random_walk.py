@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from random_walk import RandomWalk
+
+
+class RandomWalkTest(unittest.TestCase):
+    def assert_valid_walk(self, x_values, y_values):
+        self.assertEqual((x_values[0], y_values[0]), (0, 0))
+        x_steps, y_steps = np.diff(x_values), np.diff(y_values)
+        self.assertTrue(((x_steps != 0) | (y_steps != 0)).all())
+        self.assertLessEqual(np.abs(x_steps).max(), 4)
+        self.assertLessEqual(np.abs(y_steps).max(), 4)
+
+    def test_fill_walk(self):
+        rw = RandomWalk(50_000, seed=1)
+        rw.fill_walk()
+        self.assertEqual(len(rw.x_values), 50_000)
+        self.assert_valid_walk(rw.x_values, rw.y_values)
+        # Every direction and distance of the random.choice version turns up.
+        self.assertEqual(set(np.diff(rw.x_values).tolist()), set(range(-4, 5)))
+
+    def test_chunks_continue_one_walk(self):
+        chunks = list(RandomWalk(10_001, seed=2).iter_chunks(chunk_size=1_000))
+        self.assertEqual([len(x_values) for x_values, _ in chunks], [1_000] * 10 + [1])
+        self.assert_valid_walk(np.concatenate([x for x, _ in chunks]), np.concatenate([y for _, y in chunks]))
+
+    def test_write_npy_matches_the_chunks(self):
+        chunks = list(RandomWalk(5_000, seed=3).iter_chunks(chunk_size=700))
+        with tempfile.TemporaryDirectory() as directory:
+            walk = RandomWalk(5_000, seed=3).write_npy(os.path.join(directory, 'walk.npy'), chunk_size=700)
+            np.testing.assert_array_equal(walk[:, 0], np.concatenate([x for x, _ in chunks]))
+            np.testing.assert_array_equal(walk[:, 1], np.concatenate([y for _, y in chunks]))
+            del walk
+
+
+if __name__ == '__main__':
+    unittest.main()
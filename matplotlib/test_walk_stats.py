@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from density_raster import UNVISITED, DensityRaster
+from random_walk import RandomWalk
+from walk_stats import WalkStats
+
+
+def brute_force_grids(x_values, y_values, cell_size, bins):
+    density = np.zeros((bins, bins), dtype=np.int64)
+    first_visit = np.full((bins, bins), UNVISITED, dtype=np.int64)
+    for index, (x, y) in enumerate(zip(x_values.tolist(), y_values.tolist())):
+        row, column = y // cell_size + bins // 2, x // cell_size + bins // 2
+        density[row, column] += 1
+        first_visit[row, column] = min(first_visit[row, column], index)
+    return density, first_visit
+
+
+class WalkStatsTest(unittest.TestCase):
+    def test_coarsened_grids_match_a_brute_force_count(self):
+        chunks = list(RandomWalk(30_000, seed=4).iter_chunks(chunk_size=777))
+        x_values = np.concatenate([x for x, _ in chunks]).astype(np.int64)
+        y_values = np.concatenate([y for _, y in chunks]).astype(np.int64)
+        stats = WalkStats(bins=16, trace_points=100)
+        for chunk_x, chunk_y in chunks:
+            stats.update(chunk_x, chunk_y)
+
+        # The walk left the first grid several times.
+        self.assertGreaterEqual(stats.cell_size, 8)
+        density, first_visit = brute_force_grids(x_values, y_values, stats.cell_size, stats.bins)
+        np.testing.assert_array_equal(stats.density, density)
+        np.testing.assert_array_equal(stats.first_visit, first_visit)
+
+        self.assertEqual(stats.count, len(x_values))
+        self.assertEqual((stats.x_min, stats.x_max), (x_values.min(), x_values.max()))
+        self.assertEqual((stats.y_min, stats.y_max), (y_values.min(), y_values.max()))
+        self.assertEqual((stats.last_x, stats.last_y), (x_values[-1], y_values[-1]))
+        self.assertAlmostEqual(stats.max_distance, np.hypot(x_values, y_values).max())
+
+        self.assertLessEqual(len(stats.trace_index), 100)
+        self.assertTrue((stats.trace_index % stats.trace_stride == 0).all())
+        np.testing.assert_array_equal(stats.trace_x, x_values[stats.trace_index])
+        np.testing.assert_array_equal(stats.trace_y, y_values[stats.trace_index])
+
+
+class DensityRasterTest(unittest.TestCase):
+    def test_counts_match_histogram2d(self):
+        rng = np.random.default_rng(5)
+        x_values, y_values = rng.normal(size=(2, 20_000))
+        extent = (-2, 2, -1.5, 1.5)
+        raster = DensityRaster(extent, width=40, height=30)
+        for start in range(0, len(x_values), 3_000):
+            raster.add(x_values[start:start + 3_000], y_values[start:start + 3_000])
+
+        expected, _, _ = np.histogram2d(y_values, x_values, bins=(30, 40), range=(extent[2:], extent[:2]))
+        np.testing.assert_array_equal(raster.counts, expected)
+        self.assertEqual(raster.count, len(x_values))
+        columns = np.floor((x_values + 2) * 10).astype(np.int64)
+        rows = np.floor((y_values + 1.5) * 10).astype(np.int64)
+        inside = np.flatnonzero((columns >= 0) & (columns < 40) & (rows >= 0) & (rows < 30))
+        first_visit = np.full((30, 40), UNVISITED, dtype=np.int64)
+        np.minimum.at(first_visit, (rows[inside], columns[inside]), inside)
+        np.testing.assert_array_equal(raster.first_visit, first_visit)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Compare the NumPy RandomWalk.fill_walk with the original list-based loop.
+
+Prints the time and memory of both for growing walk lengths, and the step
+distribution of each so they can be checked against one another.
+
+Example:
+    python walk_benchmark.py --max-points 10000000
+"""
+import argparse
+import tracemalloc
+from collections import Counter
+from random import choice
+from time import perf_counter
+
+import numpy as np
+
+from random_walk import RandomWalk
+
+
+def fill_walk_lists(num_points):
+    """The original RandomWalk.fill_walk: one random.choice per step and axis."""
+    x_values, y_values = [0], [0]
+    while len(x_values) < num_points:
+        x_direction = choice([1, -1])
+        x_distance = choice([0, 1, 2, 3, 4])
+        x_step = x_direction * x_distance
+
+        y_direction = choice([1, -1])
+        y_distance = choice([0, 1, 2, 3, 4])
+        y_step = y_direction * y_distance
+
+        if x_step == 0 and y_step == 0:
+            continue
+
+        x_values.append(x_values[-1] + x_step)
+        y_values.append(y_values[-1] + y_step)
+    return x_values, y_values
+
+
+def measure(fill, *args):
+    tracemalloc.start()
+    start = perf_counter()
+    result = fill(*args)
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def numpy_walk(num_points, seed=0):
+    rw = RandomWalk(num_points, seed=seed)
+    rw.fill_walk()
+    return rw.x_values, rw.y_values
+
+
+def step_frequencies(x_values):
+    steps = np.diff(np.asarray(x_values))
+    counts = Counter(steps.tolist())
+    return {step: round(counts[step] / len(steps), 4) for step in range(-4, 5)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-points', type=int, default=1_000_000)
+    parser.add_argument('--max-list-points', type=int, default=1_000_000,
+                        help='skip the slow list version above this size')
+    args = parser.parse_args()
+
+    print(f"{'points':>12}{'lists s':>10}{'lists MB':>10}{'numpy s':>10}{'numpy MB':>10}")
+    num_points = 10_000
+    while num_points <= args.max_points:
+        list_cells = f"{'-':>10}{'-':>10}"
+        if num_points <= args.max_list_points:
+            _, elapsed, peak = measure(fill_walk_lists, num_points)
+            list_cells = f"{elapsed:>10.3f}{peak / 1e6:>10.1f}"
+        _, elapsed, peak = measure(numpy_walk, num_points)
+        print(f"{num_points:>12,}{list_cells}{elapsed:>10.3f}{peak / 1e6:>10.1f}")
+        num_points *= 10
+
+    print("x step frequencies, lists:", step_frequencies(fill_walk_lists(200_000)[0]))
+    print("x step frequencies, numpy:", step_frequencies(numpy_walk(200_000)[0]))
+
+
+if __name__ == '__main__':
+    main()
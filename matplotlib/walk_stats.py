@@ -0,0 +1,91 @@
+import numpy as np
+
+from density_raster import UNVISITED, density_image, first_visits
+
+
+class WalkStats:
+    """Bounding box, distances, density grids and a downsampled trace of a walk fed in chunks."""
+    def __init__(self, bins=512, trace_points=100_000):
+        if bins % 4:
+            raise ValueError("bins must be a multiple of 4")
+        self.bins = bins
+        self.cell_size = 1
+        self.density = np.zeros((bins, bins), dtype=np.int64)
+        self.first_visit = np.full((bins, bins), UNVISITED, dtype=np.int64)
+
+        self.count = 0
+        self.x_min = self.x_max = self.y_min = self.y_max = 0
+        self.max_distance = 0.0
+        self.last_x = self.last_y = 0
+
+        self.trace_points = trace_points
+        self.trace_stride = 1
+        self.trace_x = np.empty(0, dtype=np.int64)
+        self.trace_y = np.empty(0, dtype=np.int64)
+        self.trace_index = np.empty(0, dtype=np.int64)
+
+    @property
+    def last_distance(self):
+        return float(np.hypot(self.last_x, self.last_y))
+
+    def extent(self):
+        """(left, right, bottom, top) of the density grid, as imshow expects."""
+        half = self.bins // 2 * self.cell_size
+        return -half, half, -half, half
+
+    def image(self, color_by='count'):
+        return density_image(self.density, self.first_visit, color_by)
+
+    def update(self, x_values, y_values):
+        x_values = np.asarray(x_values, dtype=np.int64)
+        y_values = np.asarray(y_values, dtype=np.int64)
+        if not len(x_values):
+            return
+
+        self.x_min = min(self.x_min, int(x_values.min()))
+        self.x_max = max(self.x_max, int(x_values.max()))
+        self.y_min = min(self.y_min, int(y_values.min()))
+        self.y_max = max(self.y_max, int(y_values.max()))
+        self.max_distance = max(self.max_distance, float(np.sqrt((x_values ** 2 + y_values ** 2).max())))
+        self.last_x, self.last_y = int(x_values[-1]), int(y_values[-1])
+
+        self._update_density(x_values, y_values)
+        self._update_trace(x_values, y_values)
+        self.count += len(x_values)
+
+    def _update_density(self, x_values, y_values):
+        half = self.bins // 2
+        while (min(self.x_min, self.y_min) < -half * self.cell_size
+               or max(self.x_max, self.y_max) >= half * self.cell_size):
+            self._coarsen()
+        columns = x_values // self.cell_size + half
+        rows = y_values // self.cell_size + half
+        cells = rows * self.bins + columns
+        counts = np.bincount(cells, minlength=self.bins * self.bins)
+        self.density += counts.reshape(self.bins, self.bins)
+        first_visits(self.first_visit.reshape(-1), cells, self.count)
+
+    def _coarsen(self):
+        # Merge cells 2x2 and double the cell size; the counts stay exact for the new size.
+        quarter = self.bins // 4
+        merged = self.density.reshape(2 * quarter, 2, 2 * quarter, 2).sum(axis=(1, 3))
+        self.density = np.zeros_like(self.density)
+        self.density[quarter:3 * quarter, quarter:3 * quarter] = merged
+        merged = self.first_visit.reshape(2 * quarter, 2, 2 * quarter, 2).min(axis=(1, 3))
+        self.first_visit = np.full_like(self.first_visit, UNVISITED)
+        self.first_visit[quarter:3 * quarter, quarter:3 * quarter] = merged
+        self.cell_size *= 2
+
+    def _update_trace(self, x_values, y_values):
+        index = np.arange(self.count, self.count + len(x_values))
+        keep = index % self.trace_stride == 0
+        self.trace_x = np.concatenate([self.trace_x, x_values[keep]])
+        self.trace_y = np.concatenate([self.trace_y, y_values[keep]])
+        self.trace_index = np.concatenate([self.trace_index, index[keep]])
+        while len(self.trace_index) > self.trace_points:
+            # Halve the trace; every kept index is still a multiple of the new stride.
+            self.trace_stride *= 2
+            keep = self.trace_index % self.trace_stride == 0
+            self.trace_x = self.trace_x[keep]
+            self.trace_y = self.trace_y[keep]
+            self.trace_index = self.trace_index[keep]
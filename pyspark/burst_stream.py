@@ -0,0 +1,84 @@
+"""Detect 1-minute transaction bursts incrementally as new transaction CSVs arrive.
+
+Example:
+    python burst_stream.py data/incoming --out data/bursts --checkpoint data/bursts_checkpoint
+"""
+import argparse
+
+import pyspark.sql.functions as F
+
+from features import BURST_THRESHOLD
+from ingest import SCHEMA, TIMESTAMP_FORMAT
+from session import build_spark, default_partitions
+
+WATERMARK = "10 minutes"
+TRIGGER = "5 seconds"
+
+
+def read_transaction_stream(spark, directory, max_files_per_trigger=None):
+    """A streaming DataFrame of the transaction CSVs that appear in `directory`."""
+    reader = spark.readStream.schema(SCHEMA).option("header", True).option("timestampFormat", TIMESTAMP_FORMAT)
+    if max_files_per_trigger:
+        reader = reader.option("maxFilesPerTrigger", max_files_per_trigger)
+    return reader.csv(directory)
+
+
+def burst_stream(transactions, threshold=BURST_THRESHOLD, watermark=WATERMARK):
+    """Senders with more than `threshold` transactions in a 1-minute window, as the windows fill up."""
+    # Windows ending more than `watermark` before the latest timestamp are final, and their state is dropped.
+    counts = transactions.withWatermark("SOURCE_TIMESTAMP_UTC", watermark) \
+        .groupBy(F.window("SOURCE_TIMESTAMP_UTC", "1 minutes"), "SENDER_WALLET") \
+        .count()
+    return counts.filter(F.col("count") > threshold).select("window", "SENDER_WALLET", "count")
+
+
+def start_burst_query(bursts, checkpoint, out=None, output_mode="update", trigger=TRIGGER, available_now=False):
+    """Start writing `bursts` to Parquet files under `out`, or to the console without it."""
+    if out:
+        # In update mode the row with the highest batch_id holds a burst's latest count.
+        def append_batch(batch, batch_id):
+            batch.withColumn("batch_id", F.lit(batch_id)).write.mode("append").parquet(out)
+
+        writer = bursts.writeStream.foreachBatch(append_batch)
+    else:
+        writer = bursts.writeStream.format("console").option("truncate", False)
+    writer = writer.outputMode(output_mode).option("checkpointLocation", checkpoint) \
+        .queryName("bursts")
+    writer = writer.trigger(availableNow=True) if available_now else writer.trigger(processingTime=trigger)
+    return writer.start()
+
+
+def latest_bursts(spark, out):
+    """The bursts written by start_burst_query(), one row per window and sender with its latest count."""
+    written = spark.read.parquet(out)
+    latest = written.groupBy("window", "SENDER_WALLET").agg(F.max("batch_id").alias("batch_id"))
+    return written.join(latest, ["window", "SENDER_WALLET", "batch_id"]).select("window", "SENDER_WALLET", "count")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="where new transaction CSVs are moved in whole, once written")
+    parser.add_argument("--checkpoint", required=True, help="offsets and window state, kept across restarts")
+    parser.add_argument("--out", help="Parquet directory for the bursts (default: print them)")
+    parser.add_argument("--threshold", type=int, default=BURST_THRESHOLD)
+    parser.add_argument("--watermark", default=WATERMARK, help="how late a transaction may arrive, in event time")
+    parser.add_argument("--output-mode", choices=("update", "append"), default="update")
+    parser.add_argument("--trigger", default=TRIGGER)
+    parser.add_argument("--available-now", action="store_true", help="process the files there now, then stop")
+    parser.add_argument("--max-files-per-trigger", type=int)
+    parser.add_argument("--partitions", type=int,
+                        help="state partitions; fixed by the checkpoint once the query has run (default: 3 per core)")
+    args = parser.parse_args()
+
+    spark = build_spark()
+    # Every state partition is a store that each micro-batch opens, so keep them
+    # few; the count is then fixed in the checkpoint.
+    spark.conf.set("spark.sql.shuffle.partitions", args.partitions or default_partitions(spark))
+    transactions = read_transaction_stream(spark, args.directory, args.max_files_per_trigger)
+    query = start_burst_query(burst_stream(transactions, args.threshold, args.watermark), args.checkpoint, args.out,
+                              args.output_mode, args.trigger, args.available_now)
+    query.awaitTermination()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Density clustering of the wallet feature table on Spark executors."""
+import math
+
+import numpy as np
+import pandas as pd
+import pyspark.sql.functions as F
+from pyspark.sql.types import BooleanType, DoubleType, LongType, StringType, StructField, StructType
+from sklearn.neighbors import KDTree
+
+from components import union_find
+from features import CLUSTER_FEATURES
+from session import default_partitions
+
+NOISE = -1
+
+
+def standardize(features, columns=CLUSTER_FEATURES):
+    """Z-scores of `columns`, with missing amounts counted as 0 like the notebook did."""
+    filled = features.fillna(0, subset=list(columns))
+    stats = filled.agg(*[F.avg(name).alias(f"mean_{name}") for name in columns],
+                       *[F.stddev_pop(name).alias(f"std_{name}") for name in columns]).first()
+    return filled.select("SENDER_WALLET", *[
+        ((F.col(name) - stats[f"mean_{name}"]) / (stats[f"std_{name}"] or 1.0)).alias(name) for name in columns
+    ])
+
+
+def cluster_wallets(features, eps=0.5, min_samples=5, mode="exact", columns=CLUSTER_FEATURES, block_size=8,
+                    partitions=None):
+    """Return a DataFrame of SENDER_WALLET and cluster, with NOISE for wallets in no cluster."""
+    points = standardize(features, columns)
+    if mode == "exact":
+        # DBSCAN block by block, each with a halo eps wide; only border points between clusters may differ.
+        # The block-local labels are persisted, so their partitions are sized here.
+        partitions = partitions or default_partitions(features.sparkSession)
+        return _exact(points, eps, min_samples, list(columns), block_size, partitions)
+    if mode == "grid":
+        # Bounded memory: cells eps / sqrt(d) wide are clustered, with no distances between wallets.
+        return _grid(points, eps, min_samples, list(columns))
+    raise ValueError(f"mode must be 'exact' or 'grid', not {mode!r}")
+
+
+def _connect_cores(x, eps, side):
+    """Label core points at `x` by the connected groups they form at distance eps."""
+    if not len(x):
+        return np.empty(0, dtype=np.int64)
+    cell_keys, cells = np.unique(np.floor(x / side), axis=0, return_inverse=True)
+    cells = cells.ravel()
+    order = np.argsort(cells, kind="stable")
+    starts = np.searchsorted(cells[order], np.arange(len(cell_keys) + 1))
+    members = [order[starts[cell]:starts[cell + 1]] for cell in range(len(cell_keys))]
+    trees = {}
+
+    parent = np.arange(len(cell_keys))
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    # Cores sharing a cell are connected outright; two cells are compared once, by a nearest-neighbour
+    # query, so dense blobs never build the quadratic neighbour lists of a radius graph.
+    centres = (cell_keys + 0.5) * side
+    candidates = KDTree(centres).query_radius(centres, 2 * eps)
+    for cell, others in enumerate(candidates):
+        for other in others[others > cell]:
+            root, other_root = find(cell), find(other)
+            if root == other_root:
+                continue
+            if cell not in trees:
+                trees[cell] = KDTree(x[members[cell]])
+            distance, _ = trees[cell].query(x[members[other]], k=1)
+            if distance.min() <= eps:
+                parent[other_root] = root
+    roots = np.array([find(cell) for cell in range(len(cell_keys))])
+    return np.unique(roots, return_inverse=True)[1].ravel()[cells]
+
+
+def _block_copies(points, columns, eps, width, *extra):
+    """One row per block within eps of each point of `points`, flagged `owned` in the block it lies in."""
+    # Blocks are centred on the mean, where standardized points crowd; a corner there would copy them 2 ** d times.
+    copies = points.select("SENDER_WALLET", *columns, *extra, *[
+        F.array_distinct(F.array(*[F.floor((F.col(name) + width / 2 + offset) / width).cast("int")
+                                   for offset in (-eps, 0.0, eps)])).alias(f"block_{index}")
+        for index, name in enumerate(columns)
+    ])
+    for index in range(len(columns)):
+        copies = copies.withColumn(f"block_{index}", F.explode(f"block_{index}"))
+    block_columns = [f"block_{index}" for index in range(len(columns))]
+    return copies.select("SENDER_WALLET", *columns, *extra,
+                         F.concat_ws(",", *block_columns).alias("block"),
+                         F.array(*[F.floor((F.col(name) + width / 2) / width).cast("int") for name in columns])
+                         .eqNullSafe(F.array(*block_columns)).alias("owned"))
+
+
+def _exact(points, eps, min_samples, columns, block_size, partitions):
+    width = eps * block_size
+    side = eps / math.sqrt(len(columns))
+
+    def core_points(block):
+        x = block[columns].to_numpy()
+        owned = block["owned"].to_numpy()
+        # Wallets sharing a cell eps / sqrt(d) wide are all within eps of each
+        # other, so a cell holding min_samples of them makes every one a core point.
+        _, cells, cell_counts = np.unique(np.floor(x / side), axis=0, return_inverse=True, return_counts=True)
+        core = cell_counts[cells.ravel()] >= min_samples
+        unknown = owned & ~core
+        if unknown.any():
+            core[unknown] = KDTree(x).query_radius(x[unknown], eps, count_only=True) >= min_samples
+        result = block.loc[owned, ["SENDER_WALLET", *columns]]
+        result["core"] = core[owned]
+        return result
+
+    # The core flags come back with the coordinates, and the blocks are built
+    # again from them rather than by joining the flags onto the first copies:
+    # that self-join would let the planner take the wallet-partitioned join
+    # output for block-partitioned and skip the shuffle before local_clusters.
+    blocks = _block_copies(points, columns, eps, width).repartition(partitions, "block")
+    core = blocks.groupBy("block").applyInPandas(
+        core_points, StructType([StructField("SENDER_WALLET", StringType()),
+                                 *[StructField(name, DoubleType()) for name in columns],
+                                 StructField("core", BooleanType())]))
+    copies = _block_copies(core, columns, eps, width, "core")
+
+    def local_clusters(block):
+        is_core = block["core"].to_numpy()
+        core_block = block[is_core]
+        core_labels = _connect_cores(core_block[columns].to_numpy(), eps, side)
+        # Every copy of a core point reports its block-local cluster, for merging.
+        rows = [pd.DataFrame({"SENDER_WALLET": core_block["SENDER_WALLET"], "owned": core_block["owned"],
+                              "core": True, "local": core_labels})]
+        border = block[~is_core & block["owned"].to_numpy()]
+        if len(border):
+            local = np.full(len(border), NOISE, dtype=np.int64)
+            if len(core_block):
+                distance, nearest = KDTree(core_block[columns].to_numpy()).query(border[columns].to_numpy(), k=1)
+                reached = distance[:, 0] <= eps
+                local[reached] = core_labels[nearest[reached, 0]]
+            rows.append(pd.DataFrame({"SENDER_WALLET": border["SENDER_WALLET"], "owned": True,
+                                      "core": False, "local": local}))
+        result = pd.concat(rows, ignore_index=True)
+        result.insert(0, "block", [block["block"].iloc[0]] * len(result))
+        return result
+
+    labelled = copies.repartition(partitions, "block").groupBy("block").applyInPandas(local_clusters, StructType([
+        StructField("block", StringType()), StructField("SENDER_WALLET", StringType()),
+        StructField("owned", BooleanType()), StructField("core", BooleanType()),
+        StructField("local", LongType())])).persist()
+
+    try:
+        # A (block, local cluster) is one node; core points copied into several
+        # blocks join the nodes they belong to.
+        node = F.concat_ws(":", "block", F.col("local").cast("string"))
+        shared = labelled.filter("core").groupBy("SENDER_WALLET").agg(F.collect_set(node).alias("nodes")) \
+            .filter(F.size("nodes") > 1)
+        pairs = [(nodes[0], other) for (nodes,) in shared.select("nodes").toLocalIterator() for other in nodes[1:]]
+        roots = union_find(pairs)
+
+        owned = labelled.filter("owned").select("SENDER_WALLET", node.alias("node"), "local")
+        nodes = [row.node for row in owned.filter(F.col("local") != NOISE).select("node").distinct().collect()]
+        names = {}
+        mapping = [(node_name, names.setdefault(roots.get(node_name, node_name), len(names))) for node_name in nodes]
+        spark = points.sparkSession
+        mapping = spark.createDataFrame(mapping, "node string, cluster long")
+        labels = owned.join(F.broadcast(mapping), "node", "left") \
+            .select("SENDER_WALLET", F.coalesce("cluster", F.lit(NOISE)).alias("cluster"))
+        # Materialized here, so that the block-local labels can be dropped.
+        return labels.localCheckpoint()
+    finally:
+        labelled.unpersist()
+
+
+def _grid(points, eps, min_samples, columns):
+    side = eps / math.sqrt(len(columns))
+    cell = F.array(*[F.floor(F.col(name) / side).cast("long") for name in columns])
+    wallets = points.select("SENDER_WALLET", cell.alias("cell"))
+    counts = wallets.groupBy("cell").count()
+    core_cells = counts.filter(F.col("count") >= min_samples).select("cell")
+
+    # Every core cell and each of its 3 ** d neighbours.
+    offsets = [list(offset) for offset in np.ndindex(*(3,) * len(columns))]
+    shifted = core_cells.select("cell", F.explode(F.array(*[
+        F.array(*[F.lit(step - 1) for step in offset]) for offset in offsets])).alias("offset"))
+    shifted = shifted.select(F.col("cell").alias("core_cell"),
+                             F.zip_with("cell", "offset", lambda value, step: value + step).alias("cell"))
+    neighbours = shifted.join(counts.select("cell"), "cell")
+
+    pairs = neighbours.join(core_cells.select(F.col("cell").alias("core_neighbour")),
+                            F.col("cell") == F.col("core_neighbour")) \
+        .select(F.array_join("core_cell", ",").alias("a"), F.array_join("core_neighbour", ",").alias("b"))
+    roots = union_find((row.a, row.b) for row in pairs.toLocalIterator())
+    names = {}
+    spark = points.sparkSession
+    mapping = spark.createDataFrame([(cell, names.setdefault(root, len(names))) for cell, root in roots.items()],
+                                    "core_key string, cluster long")
+
+    # Cells that are not core take the cluster of one neighbouring core cell.
+    assignment = neighbours.select(F.array_join("cell", ",").alias("key"),
+                                   F.array_join("core_cell", ",").alias("core_key")) \
+        .join(F.broadcast(mapping), "core_key") \
+        .groupBy("key").agg(F.min("cluster").alias("cluster"))
+    return wallets.select("SENDER_WALLET", F.array_join("cell", ",").alias("key")) \
+        .join(assignment, "key", "left") \
+        .select("SENDER_WALLET", F.coalesce("cluster", F.lit(NOISE)).alias("cluster"))
@@ -0,0 +1,65 @@
+"""Time the clustering modes, and compare their labels with DBSCAN on the driver.
+
+Example:
+    python clustering_benchmark.py data/transactions --eps 0.5 --min-samples 5
+"""
+import argparse
+from time import perf_counter
+
+from sklearn.cluster import DBSCAN
+from sklearn.metrics import adjusted_rand_score
+
+from clustering import NOISE, cluster_wallets, standardize
+from features import CLUSTER_FEATURES, build_features
+from ingest import read_transactions
+from session import build_spark
+
+
+def driver_dbscan(features, eps, min_samples):
+    pandas_df = standardize(features).toPandas()
+    pandas_df["cluster"] = DBSCAN(eps=eps, min_samples=min_samples).fit_predict(
+        pandas_df[list(CLUSTER_FEATURES)].values)
+    return pandas_df[["SENDER_WALLET", "cluster"]]
+
+
+def describe(labels):
+    clusters = labels.loc[labels["cluster"] != NOISE, "cluster"].nunique()
+    noise = (labels["cluster"] == NOISE).mean() * 100
+    return f"{clusters:>10}{noise:>9.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("parquet_path", help="output of ingest.py")
+    parser.add_argument("--eps", type=float, default=0.5)
+    parser.add_argument("--min-samples", type=int, default=5)
+    parser.add_argument("--compare-wallets", type=int, default=5_000)
+    parser.add_argument("--master", default="local[*]")
+    args = parser.parse_args()
+
+    spark = build_spark(master=args.master, progress=False)
+    spark.sparkContext.setLogLevel("WARN")
+    _, features = build_features(read_transactions(spark, args.parquet_path))
+    wallets = features.count()
+    print(f"{wallets:,} wallets")
+
+    print(f"{'mode':>8}{'time s':>9}{'clusters':>10}{'noise %':>9}")
+    for mode in ("exact", "grid"):
+        start = perf_counter()
+        labels = cluster_wallets(features, args.eps, args.min_samples, mode=mode).toPandas()
+        print(f"{mode:>8}{perf_counter() - start:>9.2f}{describe(labels)}")
+
+    # Driver DBSCAN keeps every neighbour list in memory, so it only runs on a sample.
+    sample = features.sample(fraction=min(1.0, args.compare_wallets / wallets), seed=0).persist()
+    start = perf_counter()
+    driver = driver_dbscan(sample, args.eps, args.min_samples)
+    print(f"{sample.count():,} sampled wallets; driver DBSCAN {perf_counter() - start:.2f}s{describe(driver)}")
+    for mode in ("exact", "grid"):
+        labels = cluster_wallets(sample, args.eps, args.min_samples, mode=mode).toPandas()
+        merged = driver.merge(labels, on="SENDER_WALLET", suffixes=("_driver", ""))
+        print(f"{mode:>8} adjusted Rand index vs driver: "
+              f"{adjusted_rand_score(merged['cluster_driver'], merged['cluster']):.4f}")
+
+
+if __name__ == "__main__":
+    main()
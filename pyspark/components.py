@@ -0,0 +1,19 @@
+"""Connected groups of pairs, in plain Python so any stage can import them."""
+
+
+def union_find(pairs):
+    """Map every node in `pairs` to a representative of its connected group."""
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right in pairs:
+        root_left, root_right = find(left), find(right)
+        if root_left != root_right:
+            parent[root_right] = root_left
+    return {node: find(node) for node in parent}
@@ -0,0 +1,101 @@
+"""Time the pandas and Spark engines of engines.py on growing synthetic inputs, to find the crossover.
+
+Example:
+    python engine_benchmark.py data/engines --rows 100000 1000000 3000000 --check
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from engines import ENGINES, TABLE_KEYS, TABLES
+
+# Wallets with more gaps than this may get a neighbouring quantile from percentile_approx.
+EXACT_QUANTILE_GAPS = 5_000
+QUANTILE_COLUMNS = ("p10_gap", "p50_gap", "p90_gap")
+
+
+def run_script(script, *arguments):
+    """Wall seconds and peak resident MB of `python script arguments`."""
+    command = [sys.executable, str(Path(__file__).with_name(script)), *arguments]
+    start = perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = perf_counter() - start
+    if os.waitstatus_to_exitcode(status):
+        raise RuntimeError(f"{' '.join(command)} failed")
+    # ru_maxrss is in kB on Linux.
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def read_table(path):
+    table = pd.read_parquet(path)
+    for name in table.columns:
+        if pd.api.types.is_datetime64_any_dtype(table[name]):
+            table[name] = table[name].astype("datetime64[ns]")
+    return table
+
+
+def rows_that_differ(pandas_out, spark_out):
+    """Rows of each table missing from one engine's output, or with values that differ beyond rounding."""
+    differ = {}
+    for table in TABLES:
+        old, new = read_table(Path(spark_out) / table), read_table(Path(pandas_out) / table)
+        joined = old.merge(new, on=TABLE_KEYS[table], how="outer", suffixes=("_spark", "_pandas"), indicator=True)
+        mismatched = joined["_merge"] != "both"
+        for name in old.columns.difference(TABLE_KEYS[table]):
+            spark_values, pandas_values = (joined[f"{name}_{side}"] for side in ("spark", "pandas"))
+            if pd.api.types.is_datetime64_any_dtype(spark_values):
+                spark_values, pandas_values = spark_values.astype("int64"), pandas_values.astype("int64")
+            spark_values, pandas_values = spark_values.astype("float64"), pandas_values.astype("float64")
+            same = (spark_values.isna() & pandas_values.isna()) \
+                | (np.abs(spark_values - pandas_values) <= 1e-9 * np.maximum(1.0, np.abs(spark_values)))
+            if name in QUANTILE_COLUMNS:
+                same |= joined["gaps_pandas"].astype("float64") > EXACT_QUANTILE_GAPS
+            mismatched |= ~same
+        differ[table] = int(mismatched.sum())
+    return differ
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="where the synthetic CSVs and both engines' output go")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 300_000, 1_000_000, 3_000_000])
+    parser.add_argument("--wallets", type=int, default=100_000)
+    parser.add_argument("--check", action="store_true", help="also check both engines wrote the same tables")
+    args = parser.parse_args()
+
+    directory = Path(args.directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    print(f"{'rows':>10}{'CSV MB':>9}{'spark s':>10}{'pandas s':>10}{'pandas MB':>11}"
+          + (f"{'rows that differ':>18}" if args.check else ""))
+    crossover = None
+    for rows in args.rows:
+        csv_path = directory / f"transactions_{rows}.csv"
+        # In processes of their own, since a child starts with its parent's peak memory, and Spark's times
+        # include starting the JVM as they would for a scheduled job.
+        if not csv_path.exists():
+            run_script("synthetic.py", str(csv_path), "--rows", str(rows), "--wallets", str(args.wallets))
+        results = {name: run_script("engines.py", str(csv_path), str(directory / f"{name}_{rows}"), "--engine", name)
+                   for name in ENGINES}
+        line = f"{rows:>10,}{csv_path.stat().st_size / 1e6:>9.0f}{results['spark'][0]:>10.2f}" \
+            f"{results['pandas'][0]:>10.2f}{results['pandas'][1]:>11.0f}"
+        if args.check:
+            differ = rows_that_differ(directory / f"pandas_{rows}", directory / f"spark_{rows}")
+            line += f"{sum(differ.values()):>18}"
+        print(line)
+        if crossover is None and results["spark"][0] < results["pandas"][0]:
+            crossover = csv_path.stat().st_size
+    if crossover is None:
+        print("pandas was faster at every size")
+    else:
+        print(f"Spark was faster from {crossover / 1e6:.0f} MB of CSV")
+
+
+if __name__ == "__main__":
+    main()
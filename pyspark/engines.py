@@ -0,0 +1,125 @@
+"""Compute the notebook's wallet tables with Spark or with pandas, picked by the size of the input.
+
+Example:
+    python engines.py data/snapshot1_transactions.csv out
+"""
+import argparse
+import os
+import shutil
+from pathlib import Path
+from time import perf_counter
+
+import pyspark.sql.functions as F
+
+import pandas_engine
+from features import build_features, burst_windows, suspicious_senders
+from ingest import read_csv, read_transactions
+from session import build_spark, default_partitions
+from timing import inter_arrivals, timing_stats
+
+TABLES = ("features", "bursts", "suspicious_senders", "timing")
+# The columns that identify a row of each table.
+TABLE_KEYS = {
+    "features": ["SENDER_WALLET"],
+    "bursts": ["window_start", "SENDER_WALLET"],
+    "suspicious_senders": ["window_start", "SENDER_WALLET"],
+    "timing": ["PROJECT", "SENDER_WALLET"],
+}
+# A local SparkSession takes tens of seconds to start before it reads a row.
+# On one core engine_benchmark.py found pandas faster at every size it fit in memory
+# (684 MB of CSV: 16 s against 112 s, with a 1.2 GB peak), so this is a memory bound.
+# Spark pulls ahead sooner with more cores to spread its tasks over; rerun it there.
+LOCAL_MAX_BYTES = 1 << 30
+# The Parquet copy holds the same rows in about two thirds of the CSV's bytes.
+PARQUET_TO_CSV_BYTES = 1.5
+
+
+class SparkEngine:
+    name = "spark"
+
+    def __init__(self, master="local[*]", memory="6g", partitions=None):
+        self.master = master
+        self.memory = memory
+        self.partitions = partitions
+
+    def run(self, path, out):
+        spark = build_spark(master=self.master, memory=self.memory, progress=False)
+        spark.sparkContext.setLogLevel("WARN")
+        partitions = self.partitions or default_partitions(spark)
+        spark.conf.set("spark.sql.shuffle.partitions", partitions)
+        df = read_csv(spark, path) if os.path.isfile(path) else read_transactions(spark, path)
+        minutes, features = build_features(df, partitions, view_name=None)
+        flat_window = [F.col("window.start").alias("window_start"), F.col("window.end").alias("window_end")]
+        tables = {
+            "features": features,
+            "bursts": burst_windows(minutes).select(*flat_window, "SENDER_WALLET", "count"),
+            "suspicious_senders": suspicious_senders(minutes, features)
+            .select(*flat_window, "SENDER_WALLET", "count", "total_transactions"),
+            "timing": timing_stats(inter_arrivals(df, partitions=partitions)),
+        }
+        for name in TABLES:
+            tables[name].write.mode("overwrite").parquet(str(Path(out) / name))
+
+
+class PandasEngine:
+    name = "pandas"
+
+    def __init__(self, chunk_rows=pandas_engine.CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+
+    def run(self, path, out):
+        minutes, on_projects = pandas_engine.scan(path, chunk_rows=self.chunk_rows)
+        features = pandas_engine.wallet_features(minutes)
+        tables = {
+            "features": features,
+            "bursts": pandas_engine.burst_windows(minutes),
+            "suspicious_senders": pandas_engine.suspicious_senders(minutes, features),
+            "timing": pandas_engine.timing_stats(pandas_engine.inter_arrivals(on_projects, projects=None)),
+        }
+        for name in TABLES:
+            # Laid out like Spark's output, a directory of part files, replaced as a whole.
+            directory = Path(out) / name
+            shutil.rmtree(directory, ignore_errors=True)
+            directory.mkdir(parents=True)
+            tables[name].to_parquet(directory / "part-00000.parquet", index=False)
+
+
+ENGINES = {engine.name: engine for engine in (SparkEngine, PandasEngine)}
+
+
+def csv_bytes(path):
+    """Size of the input at `path`, or of its rows as a CSV for the Parquet copy."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    parquet = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+    return parquet * PARQUET_TO_CSV_BYTES
+
+
+def choose_engine(path, local_max_bytes=LOCAL_MAX_BYTES):
+    """The name of the engine for the input at `path`: "pandas" up to `local_max_bytes` of CSV, else "spark"."""
+    return "pandas" if csv_bytes(path) <= local_max_bytes else "spark"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="transaction CSV, or the Parquet copy ingest.py wrote")
+    parser.add_argument("out")
+    parser.add_argument("--engine", choices=("auto", *ENGINES), default="auto")
+    parser.add_argument("--local-max-bytes", type=int, default=LOCAL_MAX_BYTES,
+                        help="largest CSV the auto engine runs with pandas")
+    parser.add_argument("--chunk-rows", type=int, default=pandas_engine.CHUNK_ROWS, help="rows pandas reads at a time")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--memory", default="6g")
+    parser.add_argument("--partitions", type=int, help="default: 3 per core")
+    args = parser.parse_args()
+
+    name = choose_engine(args.input, args.local_max_bytes) if args.engine == "auto" else args.engine
+    engine = SparkEngine(args.master, args.memory, args.partitions) if name == "spark" \
+        else PandasEngine(args.chunk_rows)
+    start = perf_counter()
+    engine.run(args.input, args.out)
+    print(f"{name} engine: {perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
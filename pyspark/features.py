@@ -0,0 +1,97 @@
+"""Per-wallet features for the sybil analysis, built with a single shuffle."""
+import pyspark.sql.functions as F
+from pyspark import StorageLevel
+
+from session import default_partitions
+from skew import SALTS, salt
+
+# The inputs of the clustering step, in the notebook's order.
+CLUSTER_FEATURES = ("avg_daily_txn", "total_native_drop_usd", "avg_native_drop_usd",
+                    "total_stargate_swap_usd", "avg_stargate_swap_usd")
+BURST_THRESHOLD = 100
+MAX_SUSPICIOUS_TOTAL = 150
+
+
+def minute_activity(df, partitions=None, heavy=None, salts=SALTS):
+    """Transactions and amount sums per SENDER_WALLET (and salt, with `heavy`) and 1-minute window."""
+    # Adaptive execution cannot coalesce the partitions of a persisted plan.
+    partitions = partitions or default_partitions(df.sparkSession)
+    keys = ["SENDER_WALLET"]
+    base = df.select("SENDER_WALLET", "SOURCE_TIMESTAMP_UTC", "NATIVE_DROP_USD", "STARGATE_SWAP_USD")
+    if heavy:
+        # Minutes and days stay within a partition; only the per-day rows are exchanged again.
+        base = base.withColumn("salt", salt(heavy, F.to_date("SOURCE_TIMESTAMP_UTC"), salts))
+        keys.append("salt")
+    # The only shuffle: every later aggregation and join is by SENDER_WALLET and more.
+    base = base.repartition(partitions, *keys)
+    return base.groupBy(*keys, F.window("SOURCE_TIMESTAMP_UTC", "1 minutes")).agg(
+        F.count("*").alias("count"),
+        F.sum("NATIVE_DROP_USD").alias("native_drop_usd"),
+        F.count("NATIVE_DROP_USD").alias("native_drops"),
+        F.sum("STARGATE_SWAP_USD").alias("stargate_swap_usd"),
+        F.count("STARGATE_SWAP_USD").alias("stargate_swaps"),
+    )
+
+
+def wallet_features(minutes):
+    """One row per wallet with the notebook's features, from minute_activity()."""
+    # Rolling minutes up into days first counts active days without countDistinct,
+    # whose expansion would need two more exchanges.
+    keys = [name for name in ("SENDER_WALLET", "salt") if name in minutes.columns]
+    days = minutes.groupBy(*keys, F.to_date(F.col("window.start")).alias("day")).agg(
+        F.sum("count").alias("count"),
+        F.sum("native_drop_usd").alias("native_drop_usd"),
+        F.sum("native_drops").alias("native_drops"),
+        F.sum("stargate_swap_usd").alias("stargate_swap_usd"),
+        F.sum("stargate_swaps").alias("stargate_swaps"),
+        F.max("count").alias("max_txn_per_minute"),
+        F.count_if(F.col("count") > BURST_THRESHOLD).alias("burst_minutes"),
+    )
+    features = days.groupBy("SENDER_WALLET").agg(
+        F.sum("count").alias("total_transactions"),
+        F.count("*").alias("active_days"),
+        F.sum("native_drop_usd").alias("total_native_drop_usd"),
+        F.sum("native_drops").alias("native_drops"),
+        F.sum("stargate_swap_usd").alias("total_stargate_swap_usd"),
+        F.sum("stargate_swaps").alias("stargate_swaps"),
+        F.max("max_txn_per_minute").alias("max_txn_per_minute"),
+        F.sum("burst_minutes").alias("burst_minutes"),
+    )
+    # Averages over the non-null amounts only, as F.avg would have taken them.
+    return features.select(
+        "SENDER_WALLET",
+        (F.col("total_transactions") / F.col("active_days")).alias("avg_daily_txn"),
+        "total_native_drop_usd",
+        (F.col("total_native_drop_usd") / F.col("native_drops")).alias("avg_native_drop_usd"),
+        "total_stargate_swap_usd",
+        (F.col("total_stargate_swap_usd") / F.col("stargate_swaps")).alias("avg_stargate_swap_usd"),
+        "total_transactions",
+        "max_txn_per_minute",
+        "burst_minutes",
+    )
+
+
+def burst_windows(minutes, threshold=BURST_THRESHOLD):
+    """1-minute windows in which a wallet sent more than `threshold` transactions."""
+    return minutes.filter(F.col("count") > threshold).select("window", "SENDER_WALLET", "count")
+
+
+def suspicious_senders(minutes, features, threshold=BURST_THRESHOLD, max_total=MAX_SUSPICIOUS_TOTAL):
+    """Bursting wallets with fewer than `max_total` transactions in all, like the notebook's check."""
+    quiet = features.filter(F.col("total_transactions") < max_total).select("SENDER_WALLET", "total_transactions")
+    # Bursts are rare; broadcasting them avoids sorting both sides on SENDER_WALLET.
+    return F.broadcast(burst_windows(minutes, threshold)).join(quiet, on="SENDER_WALLET")
+
+
+def build_features(df, partitions=None, view_name="wallet_features", heavy=None):
+    """Return (minute activity, wallet features), persisted, with the features registered as `view_name`."""
+    # Both the features and the burst check read the minutes.
+    minutes = minute_activity(df, partitions, heavy).persist(StorageLevel.MEMORY_AND_DISK)
+    features = wallet_features(minutes).persist(StorageLevel.MEMORY_AND_DISK)
+    if view_name:
+        features.createOrReplaceTempView(view_name)
+    return minutes, features
+
+
+def save_features(features, path):
+    features.write.mode("overwrite").parquet(path)
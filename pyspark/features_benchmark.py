@@ -0,0 +1,97 @@
+"""Compare the notebook's separate groupBy/join features with features.py.
+
+Example:
+    python features_benchmark.py data/transactions
+"""
+import argparse
+import operator
+from functools import reduce
+from time import perf_counter
+
+import pyspark.sql.functions as F
+
+from features import CLUSTER_FEATURES, build_features, suspicious_senders
+from ingest import read_transactions
+from session import build_spark
+from stage_metrics import job_group_stages, summarize
+
+
+def notebook_features(df):
+    transaction_freq = df.groupBy("SENDER_WALLET", F.window("SOURCE_TIMESTAMP_UTC", "1 day")).count()
+    avg_daily_txn = transaction_freq.groupBy("SENDER_WALLET").agg(F.avg("count").alias("avg_daily_txn"))
+    amount_stats = df.groupBy("SENDER_WALLET").agg(
+        F.sum("NATIVE_DROP_USD").alias("total_native_drop_usd"),
+        F.avg("NATIVE_DROP_USD").alias("avg_native_drop_usd"),
+        F.sum("STARGATE_SWAP_USD").alias("total_stargate_swap_usd"),
+        F.avg("STARGATE_SWAP_USD").alias("avg_stargate_swap_usd")
+    )
+    feature_df = avg_daily_txn.join(amount_stats, "SENDER_WALLET")
+
+    windowed_sender_distribution = df.groupBy(F.window("SOURCE_TIMESTAMP_UTC", "1 minutes"), "SENDER_WALLET").count()
+    short_time_suspicious_senders = windowed_sender_distribution.filter(F.col("count") > 100) \
+        .orderBy(F.col("count").desc())
+    sender_activity = df.groupBy("SENDER_WALLET").agg(F.count("*").alias("total_transactions"))
+    suspicious = short_time_suspicious_senders.join(sender_activity, on="SENDER_WALLET") \
+        .filter((F.col("total_transactions") < 150) & (F.col("count") > 100))
+    return feature_df, suspicious
+
+
+def single_shuffle_features(df):
+    minutes, features = build_features(df)
+    return features.select("SENDER_WALLET", *CLUSTER_FEATURES), suspicious_senders(minutes, features)
+
+
+def run(spark, name, build, df):
+    spark.sparkContext.setJobGroup(name, name)
+    start = perf_counter()
+    feature_df, suspicious = build(df)
+    # The noop sink computes every row without collecting anything to the driver.
+    feature_df.write.format("noop").mode("overwrite").save()
+    suspicious.write.format("noop").mode("overwrite").save()
+    elapsed = perf_counter() - start
+    return elapsed, summarize(job_group_stages(spark, name)), feature_df, suspicious
+
+
+def rows_that_differ(old, new, keys, columns):
+    """Rows of `old` and `new` that are missing from either, or differ in `columns` beyond rounding."""
+    # Sums are added up in a different order, so compare to a relative tolerance.
+    joined = old.alias("old").join(new.alias("new"), keys, "full_outer")
+    differs = [~((F.col(f"old.{name}").isNull() & F.col(f"new.{name}").isNull())
+                 | (F.abs(F.col(f"old.{name}") - F.col(f"new.{name}"))
+                    <= 1e-9 * F.greatest(F.lit(1.0), F.abs(F.col(f"old.{name}")))))
+               for name in columns]
+    return joined.filter(reduce(operator.or_, differs)).count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("parquet_path", help="output of ingest.py")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--check", action="store_true", help="also check both variants agree")
+    args = parser.parse_args()
+
+    spark = build_spark(master=args.master, progress=False)
+    spark.sparkContext.setLogLevel("WARN")
+    df = read_transactions(spark, args.parquet_path)
+
+    print(f"{'variant':>10}{'time s':>9}{'stages':>8}{'tasks':>8}{'shuffle read MB':>17}{'shuffle write MB':>18}"
+          f"{'spill MB':>10}")
+    results = {}
+    for name, build in (("notebook", notebook_features), ("features", single_shuffle_features)):
+        elapsed, summary, feature_df, suspicious = run(spark, name, build, df)
+        results[name] = feature_df, suspicious
+        spill = summary["memoryBytesSpilled"] + summary["diskBytesSpilled"]
+        print(f"{name:>10}{elapsed:>9.2f}{summary['stages']:>8}{summary['tasks']:>8}"
+              f"{summary['shuffleReadBytes'] / 1e6:>17.1f}{summary['shuffleWriteBytes'] / 1e6:>18.1f}"
+              f"{spill / 1e6:>10.1f}")
+
+    if args.check:
+        (old_features, old_suspicious), (new_features, new_suspicious) = results["notebook"], results["features"]
+        mismatched = rows_that_differ(old_features, new_features, "SENDER_WALLET", CLUSTER_FEATURES)
+        columns = ["SENDER_WALLET", "window", "count", "total_transactions"]
+        mismatched += old_suspicious.select(columns).exceptAll(new_suspicious.select(columns)).count()
+        print(f"rows that differ: {mismatched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Read the transaction CSV with a declared schema and store it as partitioned Parquet.
+
+Example:
+    python ingest.py data/snapshot1_transactions.csv data/transactions
+"""
+import argparse
+
+import pyspark.sql.functions as F
+from pyspark.sql.types import DoubleType, StringType, StructField, StructType, TimestampType
+
+from session import build_spark
+
+SCHEMA = StructType([
+    StructField("SOURCE_CHAIN", StringType()),
+    StructField("SOURCE_TRANSACTION_HASH", StringType()),
+    StructField("DESTINATION_CHAIN", StringType()),
+    StructField("DESTINATION_TRANSACTION_HASH", StringType()),
+    StructField("SENDER_WALLET", StringType()),
+    StructField("SOURCE_TIMESTAMP_UTC", TimestampType()),
+    StructField("PROJECT", StringType()),
+    StructField("NATIVE_DROP_USD", DoubleType()),
+    StructField("STARGATE_SWAP_USD", DoubleType()),
+])
+TIMESTAMP_FORMAT = "yyyy-MM-dd HH:mm:ss"
+PARTITION_COLUMNS = ("SOURCE_DATE", "PROJECT")
+# How much time one SOURCE_DATE partition covers: "day", or anything F.trunc takes.
+# Daily files hold a few thousand rows each and cost more to open than a month's file to scan.
+GRANULARITY = "month"
+# Busy (day, PROJECT) partitions are split into files of at most this many rows.
+MAX_RECORDS_PER_FILE = 2_000_000
+
+
+def read_csv(spark, path):
+    return spark.read.csv(path, header=True, schema=SCHEMA, timestampFormat=TIMESTAMP_FORMAT)
+
+
+def write_parquet(df, path, granularity=GRANULARITY, mode="overwrite"):
+    """Write `df` as Parquet partitioned by SOURCE_DATE, the first day of its `granularity` period, and PROJECT."""
+    df = df.withColumn("SOURCE_DATE", _period_start(F.col("SOURCE_TIMESTAMP_UTC"), granularity))
+    # Shuffling on the partition columns gives each directory one writer, instead of
+    # one small file from every input task.
+    df.repartition(*PARTITION_COLUMNS).write \
+        .mode(mode) \
+        .option("maxRecordsPerFile", MAX_RECORDS_PER_FILE) \
+        .partitionBy(*PARTITION_COLUMNS) \
+        .parquet(path)
+
+
+def read_transactions(spark, path):
+    """The Parquet copy, with the CSV's columns plus SOURCE_DATE."""
+    return spark.read.parquet(path)
+
+
+def filter_period(df, start, end, granularity=GRANULARITY):
+    """Rows with start <= SOURCE_TIMESTAMP_UTC < end."""
+    df = df.filter((F.col("SOURCE_TIMESTAMP_UTC") >= F.lit(start)) & (F.col("SOURCE_TIMESTAMP_UTC") < F.lit(end)))
+    # On the Parquet copy, bounding SOURCE_DATE too lets Spark skip partitions.
+    if "SOURCE_DATE" in df.columns:
+        df = df.filter((F.col("SOURCE_DATE") >= _period_start(F.lit(start), granularity))
+                       & (F.col("SOURCE_DATE") < F.lit(end)))
+    return df
+
+
+def _period_start(timestamp, granularity):
+    date = F.to_date(timestamp)
+    return date if granularity == "day" else F.trunc(date, granularity)
+
+
+def ingest(spark, csv_path, parquet_path, granularity=GRANULARITY):
+    write_parquet(read_csv(spark, csv_path), parquet_path, granularity)
+    return read_transactions(spark, parquet_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv_path")
+    parser.add_argument("parquet_path")
+    parser.add_argument("--granularity", default=GRANULARITY, help='"day", "week", "month", "quarter" or "year"')
+    args = parser.parse_args()
+    ingest(build_spark(), args.csv_path, args.parquet_path, args.granularity).printSchema()
+
+
+if __name__ == "__main__":
+    main()
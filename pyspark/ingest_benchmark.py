@@ -0,0 +1,79 @@
+"""Time the notebook's CSV reads against the typed Parquet copy on synthetic data.
+
+Example:
+    python ingest_benchmark.py --rows 5000000 --data /tmp/ingest-benchmark
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import pyspark.sql.functions as F
+
+from ingest import filter_period, ingest, read_csv, read_transactions
+from session import build_spark
+from synthetic import START, write_csv
+
+
+def amounts(df):
+    return df.groupBy("SENDER_WALLET").agg(
+        F.sum("NATIVE_DROP_USD").alias("total_native_drop_usd"),
+        F.avg("NATIVE_DROP_USD").alias("avg_native_drop_usd"),
+        F.sum("STARGATE_SWAP_USD").alias("total_stargate_swap_usd"),
+        F.avg("STARGATE_SWAP_USD").alias("avg_stargate_swap_usd")
+    )
+
+
+def bursts(df):
+    first_day = START.astype(datetime)
+    week = filter_period(df.filter(F.col("PROJECT") == "Merkly"), first_day, first_day + timedelta(days=7))
+    return week.groupBy(F.window("SOURCE_TIMESTAMP_UTC", "1 minutes"), "SENDER_WALLET").count() \
+        .filter(F.col("count") > 100)
+
+
+def timed(action):
+    start = perf_counter()
+    action()
+    return perf_counter() - start
+
+
+def run(df, query):
+    # The noop sink computes every row without collecting anything to the driver.
+    query(df).write.format("noop").mode("overwrite").save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--data", default="data/ingest-benchmark", help="where the CSV and Parquet go")
+    parser.add_argument("--master", default="local[*]")
+    args = parser.parse_args()
+
+    os.makedirs(args.data, exist_ok=True)
+    csv_path = os.path.join(args.data, "transactions.csv")
+    parquet_path = os.path.join(args.data, "transactions")
+    if not os.path.exists(csv_path):
+        write_csv(csv_path, args.rows)
+
+    spark = build_spark(master=args.master, progress=False)
+    spark.sparkContext.setLogLevel("WARN")
+    print(f"{'source':>16}{'load s':>10}{'amounts s':>12}{'bursts s':>11}")
+
+    load = timed(lambda: spark.read.csv(csv_path, header=True, inferSchema=True).schema)
+    inferred = spark.read.csv(csv_path, header=True, inferSchema=True)
+    print(f"{'csv inferSchema':>16}{load:>10.2f}{timed(lambda: run(inferred, amounts)):>12.2f}"
+          f"{timed(lambda: run(inferred, bursts)):>11.2f}")
+
+    typed = read_csv(spark, csv_path)
+    print(f"{'csv schema':>16}{0:>10.2f}{timed(lambda: run(typed, amounts)):>12.2f}"
+          f"{timed(lambda: run(typed, bursts)):>11.2f}")
+
+    load = timed(lambda: ingest(spark, csv_path, parquet_path))
+    parquet = read_transactions(spark, parquet_path)
+    print(f"{'parquet':>16}{load:>10.2f}{timed(lambda: run(parquet, amounts)):>12.2f}"
+          f"{timed(lambda: run(parquet, bursts)):>11.2f}")
+    print("parquet load is the one-off conversion; csv inferSchema load is paid on every read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Run the sybil analysis of main.ipynb as a batch job and write its results to files.
+
+Examples:
+    python main.py data/snapshot1_transactions.csv out --partitions 12 --memory 4g
+    python main.py --benchmark 1000000 out/benchmark
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+from time import perf_counter
+
+from clustering import cluster_wallets
+from features import build_features, burst_windows, suspicious_senders
+from ingest import ingest, read_transactions
+from session import build_spark, default_partitions
+from skew import heavy_keys
+from stage_metrics import job_group_stages, stage_report
+from synthetic import write_csv
+from timing import (coordinated_groups, inter_arrivals, oversized_buckets, similar_wallets, timing_signatures,
+                    timing_stats)
+
+
+class Job:
+    """Runs the stages on one SparkSession and records what each of them cost."""
+
+    def __init__(self, spark, out):
+        self.spark = spark
+        self.out = Path(out)
+        self.report = []
+
+    def run(self, name, stage):
+        self.spark.sparkContext.setJobGroup(name, f"main.py {name}")
+        start = perf_counter()
+        results = stage() or {}
+        elapsed = perf_counter() - start
+        self.report.append({"stage": name, "seconds": round(elapsed, 3), **results,
+                            "spark_stages": stage_report(job_group_stages(self.spark, name))})
+
+    def write(self, df, table):
+        # Results are written once and nothing is counted on the way, so no table is computed twice.
+        df.write.mode("overwrite").parquet(str(self.out / table))
+
+
+def run_job(spark, input_path, out, partitions, eps=0.5, min_samples=5, cluster_mode="exact", split_heavy=False):
+    """Run every stage on the transactions at `input_path` and return the per-stage report."""
+    job = Job(spark, out)
+    tables = {}
+
+    def ingest_stage():
+        tables["transactions"] = ingest(spark, input_path, str(job.out / "transactions"))
+
+    def features_stage():
+        df = tables["transactions"]
+        tables["heavy"] = heavy_keys(df, partitions) if split_heavy else None
+        tables["minutes"], tables["features"] = build_features(df, partitions, heavy=tables["heavy"])
+        job.write(tables["features"], "features")
+
+    def clusters_stage():
+        job.write(cluster_wallets(tables["features"], eps, min_samples, mode=cluster_mode, partitions=partitions),
+                  "clusters")
+
+    def bursts_stage():
+        job.write(burst_windows(tables["minutes"]), "bursts")
+        job.write(suspicious_senders(tables["minutes"], tables["features"]), "suspicious_senders")
+
+    def timing_stage():
+        gaps = inter_arrivals(tables["transactions"], partitions=partitions, heavy=tables["heavy"]).persist()
+        job.write(timing_stats(gaps), "timing")
+        signatures = timing_signatures(gaps).persist()
+        job.write(coordinated_groups(similar_wallets(signatures), oversized_buckets(signatures)), "coordinated_groups")
+        signatures.unpersist()
+        gaps.unpersist()
+        # Band values too busy to compare pairwise; read back from the output rather than recomputed.
+        groups = spark.read.parquet(str(job.out / "coordinated_groups"))
+        return {"oversized_groups": groups.filter("oversized").select("group").distinct().count()}
+
+    if os.path.isfile(input_path):
+        job.run("ingest", ingest_stage)
+    else:
+        tables["transactions"] = read_transactions(spark, input_path)
+    for name, stage in (("features", features_stage), ("clusters", clusters_stage), ("bursts", bursts_stage),
+                        ("timing", timing_stage)):
+        job.run(name, stage)
+    return job.report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", nargs="?", help="transaction CSV, or the Parquet copy ingest.py wrote")
+    parser.add_argument("out")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="run on ROWS synthetic transactions instead")
+    parser.add_argument("--wallets", type=int, default=100_000, help="wallets in the synthetic data")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--memory", default="6g", help="driver and executor memory")
+    parser.add_argument("--partitions", type=int, help="wallet stage and shuffle partitions (default: 3 per core)")
+    parser.add_argument("--eps", type=float, default=0.5)
+    parser.add_argument("--min-samples", type=int, default=5)
+    parser.add_argument("--cluster-mode", choices=("exact", "grid"), default="exact")
+    parser.add_argument("--split-heavy", action="store_true", help="spread wallets with very many rows over tasks")
+    args = parser.parse_args()
+    if (args.input is None) == (args.benchmark is None):
+        parser.error("give either INPUT or --benchmark ROWS")
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    input_path = args.input
+    if args.benchmark is not None:
+        input_path = str(out / "synthetic.csv")
+        start = perf_counter()
+        write_csv(input_path, args.benchmark, wallets=args.wallets)
+        print(f"{args.benchmark:,} synthetic transactions written in {perf_counter() - start:.2f}s")
+
+    spark = build_spark(master=args.master, memory=args.memory, progress=False)
+    spark.sparkContext.setLogLevel("WARN")
+    partitions = args.partitions or default_partitions(spark)
+    spark.conf.set("spark.sql.shuffle.partitions", partitions)
+    start = perf_counter()
+    stages = run_job(spark, input_path, out, partitions, args.eps, args.min_samples,
+                     args.cluster_mode, args.split_heavy)
+    total = perf_counter() - start
+
+    settings = {name: value for name, value in vars(args).items() if name != "out"}
+    settings["partitions"] = partitions
+    report = {"settings": settings, "seconds": round(total, 3), "stages": stages}
+    (out / "report.json").write_text(json.dumps(report, indent=2))
+
+    print(f"{'stage':>10}{'time s':>9}{'spark stages':>14}{'shuffle read MB':>17}{'shuffle write MB':>18}"
+          f"{'spill MB':>10}")
+    for stage in stages:
+        spark_stages = stage["spark_stages"]
+        spill = sum(item["memoryBytesSpilled"] + item["diskBytesSpilled"] for item in spark_stages)
+        print(f"{stage['stage']:>10}{stage['seconds']:>9.2f}{len(spark_stages):>14}"
+              f"{sum(item['shuffleReadBytes'] for item in spark_stages) / 1e6:>17.1f}"
+              f"{sum(item['shuffleWriteBytes'] for item in spark_stages) / 1e6:>18.1f}{spill / 1e6:>10.1f}")
+    oversized = sum(stage.get("oversized_groups", 0) for stage in stages)
+    if oversized:
+        print(f"{oversized} band buckets too big to compare pairwise; flagged oversized in coordinated_groups")
+    print(f"{'total':>10}{total:>9.2f}; report in {out / 'report.json'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""The tables of features.py and timing.py, computed with pandas in one process."""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+
+from features import BURST_THRESHOLD, MAX_SUSPICIOUS_TOTAL
+from timing import MIN_GAPS, QUANTILES, SYBIL_PROJECTS
+
+CHUNK_ROWS = 1_000_000
+# Bytes per row of the transaction CSV, to turn CHUNK_ROWS into a CSV block size.
+CSV_ROW_BYTES = 250
+COLUMN_TYPES = {
+    "SENDER_WALLET": pa.string(),
+    "SOURCE_TIMESTAMP_UTC": pa.timestamp("s"),
+    "PROJECT": pa.string(),
+    "NATIVE_DROP_USD": pa.float64(),
+    "STARGATE_SWAP_USD": pa.float64(),
+}
+MINUTE_KEYS = ["SENDER_WALLET", "window_start"]
+GAP_KEYS = ["PROJECT", "SENDER_WALLET"]
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield the COLUMN_TYPES columns of a transaction CSV, or of the Parquet copy ingest.py wrote, as DataFrames."""
+    if os.path.isfile(path):
+        batches = pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(block_size=chunk_rows * CSV_ROW_BYTES),
+            convert_options=pa_csv.ConvertOptions(column_types=COLUMN_TYPES, include_columns=list(COLUMN_TYPES),
+                                                  timestamp_parsers=["%Y-%m-%d %H:%M:%S"]),
+        )
+    else:
+        # PROJECT is a directory name in the Parquet copy, so read the hive partitioning too.
+        batches = ds.dataset(path, format="parquet", partitioning="hive") \
+            .to_batches(columns=list(COLUMN_TYPES), batch_size=chunk_rows)
+    for batch in batches:
+        yield batch.to_pandas()
+
+
+def scan(path, projects=SYBIL_PROJECTS, chunk_rows=CHUNK_ROWS):
+    """Read the transactions at `path` once; return their minute activity, and the rows on `projects`."""
+    # Each chunk is reduced right away, so only the minute sums and three columns of the rows stay in memory.
+    minutes, on_projects = [], []
+    for chunk in read_chunks(path, chunk_rows):
+        minutes.append(minute_activity(chunk))
+        on_projects.append(_on_projects(chunk, projects)[["PROJECT", "SENDER_WALLET", "SOURCE_TIMESTAMP_UTC"]])
+    # A wallet's minute can span two chunks, so the chunks' sums are summed once more.
+    return _minute_sums(pd.concat(minutes, ignore_index=True)), pd.concat(on_projects, ignore_index=True)
+
+
+def _on_projects(df, projects):
+    if not projects:
+        return df
+    return df[df["PROJECT"].str.lower().isin([project.lower() for project in projects])]
+
+
+def minute_activity(df):
+    """Transactions and amount sums per SENDER_WALLET and 1-minute window_start, like features.minute_activity()."""
+    keyed = df.assign(window_start=df["SOURCE_TIMESTAMP_UTC"].dt.floor("min"),
+                      count=1,
+                      native_drop_usd=df["NATIVE_DROP_USD"],
+                      native_drops=df["NATIVE_DROP_USD"].notna().astype("int64"),
+                      stargate_swap_usd=df["STARGATE_SWAP_USD"],
+                      stargate_swaps=df["STARGATE_SWAP_USD"].notna().astype("int64"))
+    return _minute_sums(keyed)
+
+
+def _minute_sums(df):
+    grouped = df.groupby(MINUTE_KEYS, sort=False)
+    # min_count=1 leaves a sum of nothing but nulls null, as F.sum does.
+    return pd.DataFrame({
+        "count": grouped["count"].sum(),
+        "native_drop_usd": grouped["native_drop_usd"].sum(min_count=1),
+        "native_drops": grouped["native_drops"].sum(),
+        "stargate_swap_usd": grouped["stargate_swap_usd"].sum(min_count=1),
+        "stargate_swaps": grouped["stargate_swaps"].sum(),
+    }).reset_index()
+
+
+def wallet_features(minutes, threshold=BURST_THRESHOLD):
+    """One row per wallet with the columns of features.wallet_features(), from minute_activity()."""
+    wallets = minutes.assign(day=minutes["window_start"].dt.floor("D"),
+                             burst=(minutes["count"] > threshold).astype("int64")).groupby("SENDER_WALLET")
+    total_transactions = wallets["count"].sum()
+    total_native_drop_usd = wallets["native_drop_usd"].sum(min_count=1)
+    total_stargate_swap_usd = wallets["stargate_swap_usd"].sum(min_count=1)
+    return pd.DataFrame({
+        "avg_daily_txn": total_transactions / wallets["day"].nunique(),
+        "total_native_drop_usd": total_native_drop_usd,
+        "avg_native_drop_usd": total_native_drop_usd / wallets["native_drops"].sum(),
+        "total_stargate_swap_usd": total_stargate_swap_usd,
+        "avg_stargate_swap_usd": total_stargate_swap_usd / wallets["stargate_swaps"].sum(),
+        "total_transactions": total_transactions,
+        "max_txn_per_minute": wallets["count"].max(),
+        "burst_minutes": wallets["burst"].sum(),
+    }).reset_index()
+
+
+def burst_windows(minutes, threshold=BURST_THRESHOLD):
+    """1-minute windows in which a wallet sent more than `threshold` transactions."""
+    bursts = minutes[minutes["count"] > threshold]
+    # Flat window_start and window_end columns, which engines.py also gives the Spark tables.
+    return pd.DataFrame({
+        "window_start": bursts["window_start"],
+        "window_end": bursts["window_start"] + pd.Timedelta(minutes=1),
+        "SENDER_WALLET": bursts["SENDER_WALLET"],
+        "count": bursts["count"],
+    }).reset_index(drop=True)
+
+
+def suspicious_senders(minutes, features, threshold=BURST_THRESHOLD, max_total=MAX_SUSPICIOUS_TOTAL):
+    """Bursting wallets with fewer than `max_total` transactions in all."""
+    quiet = features.loc[features["total_transactions"] < max_total, ["SENDER_WALLET", "total_transactions"]]
+    return burst_windows(minutes, threshold).merge(quiet, on="SENDER_WALLET")
+
+
+def inter_arrivals(df, projects=SYBIL_PROJECTS):
+    """Rows on `projects` with time_diff, the seconds since the wallet's previous transaction on that PROJECT."""
+    df = _on_projects(df, projects)
+    seconds = df["SOURCE_TIMESTAMP_UTC"].astype("datetime64[s]").astype("int64")
+    ordered = df.assign(seconds=seconds).sort_values(["SENDER_WALLET", "PROJECT", "seconds"])
+    time_diff = ordered.groupby(["SENDER_WALLET", "PROJECT"], sort=False)["seconds"].diff()
+    return ordered[["PROJECT", "SENDER_WALLET", "SOURCE_TIMESTAMP_UTC"]].assign(time_diff=time_diff.astype("Int64"))
+
+
+def timing_stats(gaps, quantiles=QUANTILES, min_gaps=MIN_GAPS):
+    """Gap statistics per PROJECT and SENDER_WALLET from inter_arrivals(), as timing.timing_stats() computes them."""
+    grouped = gaps.groupby(GAP_KEYS, sort=False)["time_diff"]
+    stats = pd.DataFrame({
+        "transactions": grouped.size(),
+        "gaps": grouped.count(),
+        "mean_gap": grouped.mean(),
+        "var_gap": grouped.var(ddof=0),
+        "min_gap": grouped.min(),
+        "max_gap": grouped.max(),
+    })
+    # Sorted once, the q quantile of each group is its ceil(q * n)-th gap: exact, where percentile_approx
+    # can pick a neighbouring gap past a few thousand.
+    ordered = gaps.dropna(subset=["time_diff"]).sort_values([*GAP_KEYS, "time_diff"])
+    rank = ordered.groupby(GAP_KEYS, sort=False).cumcount().to_numpy() + 1
+    size = ordered.groupby(GAP_KEYS, sort=False)["time_diff"].transform("size").to_numpy()
+    for quantile in quantiles:
+        picked = ordered[rank == np.maximum(np.ceil(quantile * size), 1)]
+        stats[f"p{round(quantile * 100)}_gap"] = picked.set_index(GAP_KEYS)["time_diff"]
+    variation = np.sqrt(stats["var_gap"]) / stats["mean_gap"]
+    stats["periodicity"] = (1 - variation.clip(upper=1.0)).where((stats["gaps"] >= min_gaps)
+                                                                  & (stats["mean_gap"] > 0))
+    return stats.reset_index()
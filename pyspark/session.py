@@ -0,0 +1,23 @@
+from pyspark.sql import SparkSession
+
+APP_NAME = "LayerZeroTransactionAnalysis"
+
+
+def build_spark(app_name=APP_NAME, master=None, memory="6g", progress=True):
+    """Get or create the SparkSession every stage runs on."""
+    # The data's timestamps are UTC; in the machine's time zone, day windows and date partitions would shift.
+    # Cached plans keep their partitioning, so aggregating a cached frame by its keys adds no exchange.
+    builder = SparkSession.builder.appName(app_name) \
+        .config("spark.executor.memory", memory) \
+        .config("spark.driver.memory", memory) \
+        .config("spark.sql.session.timeZone", "UTC") \
+        .config("spark.sql.optimizer.canChangeCachedPlanOutputPartitioning", "false") \
+        .config("spark.ui.showConsoleProgress", str(progress).lower())
+    if master:
+        builder = builder.master(master)
+    return builder.getOrCreate()
+
+
+def default_partitions(spark):
+    """Three partitions per core, for the stages whose partitions are persisted or fixed and cannot be coalesced."""
+    return 3 * spark.sparkContext.defaultParallelism
@@ -0,0 +1,30 @@
+"""Find the SENDER_WALLETs that hold a large share of the rows, and spread them out."""
+import math
+
+import pyspark.sql.functions as F
+
+SAMPLE_FRACTION = 0.01
+# A wallet is heavy once it alone would fill this share of an average partition.
+HEAVY_SHARE = 0.5
+SALTS = 16
+
+
+def heavy_keys(df, partitions, key="SENDER_WALLET", fraction=SAMPLE_FRACTION, share=HEAVY_SHARE, seed=0):
+    """Values of `key` estimated, from a sample, to fill over `share` of one of `partitions` even partitions."""
+    counts = df.select(key).sample(fraction=fraction, seed=seed).groupBy(key).count().persist()
+    try:
+        sampled = counts.agg(F.sum("count")).first()[0] or 0
+        # No more than partitions / share keys can each hold that much, so only the
+        # biggest few reach the driver.
+        top = counts.orderBy(F.col("count").desc()).limit(math.ceil(partitions / share)).collect()
+    finally:
+        counts.unpersist()
+    return {row[key] for row in top if row["count"] > max(1.0, sampled / partitions * share)}
+
+
+def salt(heavy, by, salts=SALTS, key="SENDER_WALLET"):
+    """A column that is 0 for light keys and, for keys in `heavy`, a hash of `by` modulo `salts`."""
+    if not heavy:
+        return F.lit(0)
+    # Salting by day keeps anything grouped within a day in one task.
+    return F.when(F.col(key).isin(sorted(heavy)), F.pmod(F.xxhash64(by), F.lit(salts))).otherwise(F.lit(0))
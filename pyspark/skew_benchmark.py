@@ -0,0 +1,72 @@
+"""Compare the wallet stages with and without splitting heavy wallets, on skewed data.
+
+Example:
+    python synthetic.py data/skewed.csv --rows 2000000 --skew 1.3
+    python ingest.py data/skewed.csv data/skewed
+    python skew_benchmark.py data/skewed --partitions 12
+"""
+import argparse
+from time import perf_counter
+
+from features import CLUSTER_FEATURES, build_features, suspicious_senders
+from features_benchmark import rows_that_differ
+from ingest import read_transactions
+from session import build_spark, default_partitions
+from skew import heavy_keys
+from stage_metrics import job_group_stages, task_skew
+from timing import inter_arrivals, timing_stats
+
+
+def run(spark, name, df, partitions, heavy):
+    spark.sparkContext.setJobGroup(name, name)
+    start = perf_counter()
+    minutes, features = build_features(df, partitions, view_name=None, heavy=heavy)
+    suspicious = suspicious_senders(minutes, features)
+    stats = timing_stats(inter_arrivals(df, partitions=partitions, heavy=heavy))
+    for result in (features, suspicious, stats):
+        result.write.format("noop").mode("overwrite").save()
+    elapsed = perf_counter() - start
+    return elapsed, task_skew(spark, job_group_stages(spark, name)), (features, suspicious, stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("parquet_path", help="output of ingest.py")
+    parser.add_argument("--partitions", type=int, help="default: 3 per core")
+    parser.add_argument("--master", default="local[*]")
+    parser.add_argument("--check", action="store_true", help="also check both variants agree")
+    args = parser.parse_args()
+
+    spark = build_spark(master=args.master, progress=False)
+    spark.sparkContext.setLogLevel("WARN")
+    df = read_transactions(spark, args.parquet_path)
+    partitions = args.partitions or default_partitions(spark)
+
+    start = perf_counter()
+    heavy = heavy_keys(df, partitions)
+    print(f"{len(heavy)} heavy wallets found in {perf_counter() - start:.2f}s from a sample")
+
+    print(f"{'variant':>8}{'time s':>9}{'stages':>8}{'slowest tasks s':>17}{'skew':>8}")
+    results = {}
+    for name, variant_heavy in (("plain", None), ("salted", heavy)):
+        elapsed, stages, results[name] = run(spark, name, df, partitions, variant_heavy)
+        # What the stages would take with a core per task, which is what a straggler holds up.
+        slowest = sum(stage["run_ms"][1.0] for stage in stages) / 1000
+        # A single task is its own median.
+        skew = max((stage["skew"] for stage in stages if stage["tasks"] > 1), default=1.0)
+        print(f"{name:>8}{elapsed:>9.2f}{len(stages):>8}{slowest:>17.2f}{skew:>8.1f}")
+
+    if args.check:
+        (old_features, old_suspicious, old_stats), (new_features, new_suspicious, new_stats) = \
+            results["plain"], results["salted"]
+        mismatched = rows_that_differ(old_features, new_features, "SENDER_WALLET", CLUSTER_FEATURES)
+        columns = ["SENDER_WALLET", "window", "count", "total_transactions"]
+        mismatched += old_suspicious.select(columns).exceptAll(new_suspicious.select(columns)).count()
+        # percentile_approx merges its sketches in another order, so only the exact statistics are compared.
+        mismatched += rows_that_differ(old_stats, new_stats, ["PROJECT", "SENDER_WALLET"],
+                                       ["transactions", "gaps", "mean_gap", "var_gap", "min_gap", "max_gap"])
+        print(f"rows that differ: {mismatched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""The Java check and local session the Spark test modules share."""
+import os
+import shutil
+import unittest
+
+from session import build_spark
+
+HAS_JAVA = bool(os.environ.get("JAVA_HOME") or shutil.which("java"))
+requires_java = unittest.skipUnless(HAS_JAVA, "Spark needs Java")
+
+
+def local_spark():
+    return build_spark(master="local[1]", memory="1g", progress=False)
@@ -0,0 +1,72 @@
+"""Stage counts, shuffle sizes and task skew of Spark jobs, read from the driver's status REST API."""
+import json
+import time
+from datetime import datetime
+from urllib.request import urlopen
+
+STAGE_FIELDS = ("executorRunTime", "shuffleReadBytes", "shuffleWriteBytes", "memoryBytesSpilled", "diskBytesSpilled")
+TASK_QUANTILES = (0.5, 0.95, 1.0)
+
+
+def _get(spark, path):
+    context = spark.sparkContext
+    url = f"{context.uiWebUrl}/api/v1/applications/{context.applicationId}/{path}"
+    with urlopen(url) as response:
+        return json.load(response)
+
+
+def job_group_stages(spark, group, settle=5.0):
+    """The stages that ran (not the skipped ones) for jobs started under job group `group`."""
+    # The status store is filled in after the action returns, so wait for the group's jobs.
+    deadline = time.monotonic() + settle
+    while True:
+        jobs = [job for job in _get(spark, "jobs") if job.get("jobGroup") == group]
+        if all(job["status"] != "RUNNING" for job in jobs) or time.monotonic() > deadline:
+            break
+        time.sleep(0.1)
+    stage_ids = {stage_id for job in jobs for stage_id in job["stageIds"]}
+    return [stage for stage in _get(spark, "stages")
+            if stage["stageId"] in stage_ids and stage["status"] == "COMPLETE"]
+
+
+def stage_report(stages):
+    """One JSON-ready dict per stage: id, name, tasks, duration_ms and the STAGE_FIELDS."""
+    return [{
+        "stage": stage["stageId"],
+        "name": stage["name"],
+        "tasks": stage["numCompleteTasks"],
+        "duration_ms": _duration_ms(stage),
+        **{field: stage.get(field, 0) for field in STAGE_FIELDS},
+    } for stage in sorted(stages, key=lambda stage: stage["stageId"])]
+
+
+def _duration_ms(stage):
+    # Times look like 2024-01-31T12:00:00.000GMT.
+    submitted, completed = (datetime.strptime(stage[name], "%Y-%m-%dT%H:%M:%S.%f%Z")
+                            for name in ("submissionTime", "completionTime"))
+    return round((completed - submitted).total_seconds() * 1000)
+
+
+def summarize(stages):
+    summary = {"stages": len(stages), "tasks": sum(stage["numCompleteTasks"] for stage in stages)}
+    for field in STAGE_FIELDS:
+        summary[field] = sum(stage.get(field, 0) for stage in stages)
+    return summary
+
+
+def task_skew(spark, stages, quantiles=TASK_QUANTILES):
+    """Per stage, the run time and shuffle read of its tasks at `quantiles`, which must include 0.5 and 1.0."""
+    query = ",".join(str(quantile) for quantile in quantiles)
+    rows = []
+    for stage in stages:
+        summary = _get(spark, f"stages/{stage['stageId']}/{stage['attemptId']}/taskSummary?quantiles={query}")
+        run_ms = dict(zip(quantiles, summary["executorRunTime"]))
+        rows.append({
+            "stage": stage["stageId"],
+            "tasks": stage["numCompleteTasks"],
+            "run_ms": run_ms,
+            "read_bytes": dict(zip(quantiles, summary["shuffleReadMetrics"]["readBytes"])),
+            # However many cores there are, a stage lasts at least as long as its slowest task.
+            "skew": run_ms[1.0] / max(run_ms[0.5], 1.0),
+        })
+    return rows
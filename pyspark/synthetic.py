@@ -0,0 +1,105 @@
+"""Generate transaction CSVs shaped like snapshot1_transactions.csv, for local benchmarks.
+
+Example:
+    python synthetic.py data/synthetic.csv --rows 5000000 --wallets 200000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ("SOURCE_CHAIN", "SOURCE_TRANSACTION_HASH", "DESTINATION_CHAIN", "DESTINATION_TRANSACTION_HASH",
+           "SENDER_WALLET", "SOURCE_TIMESTAMP_UTC", "PROJECT", "NATIVE_DROP_USD", "STARGATE_SWAP_USD")
+CHAINS = ("Arbitrum", "Optimism", "Polygon", "BNB Chain", "Avalanche", "Base", "Ethereum",
+          "Orderly Mainnet", "zkSync Era", "Scroll")
+PROJECTS = ("Merkly", "L2Pass", "Stargate", "Zerius", "Holograph", "Orbiter", "Aptos Bridge")
+PROJECT_WEIGHTS = (0.3, 0.2, 0.25, 0.1, 0.05, 0.05, 0.05)
+START = np.datetime64("2023-11-01T00:00:00", "s")
+
+# Two hex digits for every byte value, to turn random bytes into hashes in one go.
+_HEX = np.array([f"{byte:02x}".encode() for byte in range(256)], dtype="S2")
+
+
+def hex_strings(rng, count, num_bytes):
+    """`count` random "0x..." strings of `num_bytes` bytes, like hashes and addresses."""
+    digits = _HEX[rng.integers(0, 256, size=(count, num_bytes), dtype=np.uint8)]
+    return np.char.add(b"0x", digits.view(f"S{2 * num_bytes}").ravel()).astype(str)
+
+
+class TransactionGenerator:
+    def __init__(self, wallets=100_000, days=180, skew=1.1, burst_wallets=20, burst_size=(101, 600), seed=0):
+        self.rng = np.random.default_rng(seed)
+        self.days = days
+        self.wallets = hex_strings(self.rng, wallets, 20)
+        weights = 1 / np.arange(1, wallets + 1) ** skew
+        self.wallet_weights = weights / weights.sum()
+        self.burst_wallets = burst_wallets
+        self.burst_size = burst_size
+
+    def chunks(self, rows, chunk_rows=1_000_000):
+        """Yield DataFrames with `rows` transactions in total, the bot bursts first."""
+        done = 0
+        if self.burst_wallets:
+            bursts = self._bursts().iloc[:rows]
+            done += len(bursts)
+            yield bursts
+        while done < rows:
+            size = min(chunk_rows, rows - done)
+            wallets = self.rng.choice(len(self.wallets), size=size, p=self.wallet_weights)
+            seconds = self.rng.integers(0, self.days * 86_400, size=size)
+            done += size
+            yield self._transactions(wallets, seconds)
+
+    def _bursts(self):
+        # Bots are drawn from the quiet tail, so the burst is most of what they ever do.
+        bots = self.rng.choice(np.arange(len(self.wallets) // 2, len(self.wallets)), size=self.burst_wallets,
+                               replace=False)
+        sizes = self.rng.integers(self.burst_size[0], self.burst_size[1] + 1, size=self.burst_wallets)
+        minutes = self.rng.integers(0, self.days * 1440, size=self.burst_wallets)
+        wallets = np.repeat(bots, sizes)
+        seconds = np.repeat(minutes * 60, sizes) + self.rng.integers(0, 60, size=sizes.sum())
+        return self._transactions(wallets, seconds)
+
+    def _transactions(self, wallets, seconds):
+        size = len(wallets)
+        projects = self.rng.choice(len(PROJECTS), size=size, p=PROJECT_WEIGHTS)
+        native_drop = np.where(self.rng.random(size) < 0.2, self.rng.lognormal(0, 1.5, size=size), np.nan)
+        is_swap = projects == PROJECTS.index("Stargate")
+        swap = np.where(is_swap, self.rng.lognormal(5, 2, size=size), np.nan)
+        return pd.DataFrame({
+            "SOURCE_CHAIN": np.asarray(CHAINS)[self.rng.integers(0, len(CHAINS), size=size)],
+            "SOURCE_TRANSACTION_HASH": hex_strings(self.rng, size, 32),
+            "DESTINATION_CHAIN": np.asarray(CHAINS)[self.rng.integers(0, len(CHAINS), size=size)],
+            "DESTINATION_TRANSACTION_HASH": hex_strings(self.rng, size, 32),
+            "SENDER_WALLET": self.wallets[wallets],
+            "SOURCE_TIMESTAMP_UTC": START + seconds.astype("timedelta64[s]"),
+            "PROJECT": np.asarray(PROJECTS)[projects],
+            "NATIVE_DROP_USD": native_drop.round(2),
+            "STARGATE_SWAP_USD": swap.round(2),
+        }, columns=COLUMNS)
+
+
+def write_csv(path, rows, chunk_rows=1_000_000, **kwargs):
+    """Write `rows` synthetic transactions to `path`; kwargs go to TransactionGenerator."""
+    generator = TransactionGenerator(**kwargs)
+    for index, chunk in enumerate(generator.chunks(rows, chunk_rows)):
+        chunk.to_csv(path, mode="w" if index == 0 else "a", header=index == 0, index=False,
+                     date_format="%Y-%m-%d %H:%M:%S")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--wallets", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of wallet activity")
+    parser.add_argument("--burst-wallets", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_csv(args.path, args.rows, wallets=args.wallets, days=args.days, skew=args.skew,
+              burst_wallets=args.burst_wallets, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from burst_stream import burst_stream, latest_bursts, read_transaction_stream, start_burst_query
+from spark_testing import local_spark, requires_java
+from synthetic import TransactionGenerator
+
+THRESHOLD = 5
+
+
+@requires_java
+class BurstStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.spark = local_spark()
+        self.spark.conf.set("spark.sql.shuffle.partitions", 2)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.incoming = os.path.join(self.directory, "incoming")
+        os.mkdir(self.incoming)
+
+    def drop_file(self, name, df):
+        # Written elsewhere and moved in whole, as the stream expects.
+        path = os.path.join(self.directory, name)
+        df.to_csv(path, index=False, date_format="%Y-%m-%d %H:%M:%S")
+        os.rename(path, os.path.join(self.incoming, name))
+
+    def run_available(self):
+        bursts = burst_stream(read_transaction_stream(self.spark, self.incoming), THRESHOLD, "2 days")
+        query = start_burst_query(bursts, os.path.join(self.directory, "checkpoint"),
+                                  os.path.join(self.directory, "bursts"), available_now=True)
+        query.awaitTermination()
+
+    def test_bursts_across_runs_match_a_batch_count(self):
+        generator = TransactionGenerator(wallets=20, days=1, burst_wallets=3, burst_size=(4, 8), seed=3)
+        transactions = pd.concat(generator.chunks(600, chunk_rows=200), ignore_index=True) \
+            .sort_values("SOURCE_TIMESTAMP_UTC")
+        # Every window is split over two files, read by two separate runs; the watermark
+        # is wider than the data, so the second file is not late.
+        first, second = transactions.iloc[::2], transactions.iloc[1::2]
+        self.drop_file("first.csv", first)
+        self.run_available()
+        self.drop_file("second.csv", second)
+        self.run_available()
+
+        minutes = transactions.groupby(["SENDER_WALLET", transactions["SOURCE_TIMESTAMP_UTC"].dt.floor("min")]).size()
+        expected = sorted((wallet, minute.to_pydatetime(), count)
+                          for (wallet, minute), count in minutes[minutes > THRESHOLD].items())
+        found = sorted((row.SENDER_WALLET, row.window.start, row["count"])
+                       for row in latest_bursts(self.spark, os.path.join(self.directory, "bursts")).collect())
+        self.assertTrue(expected)
+        self.assertEqual(found, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
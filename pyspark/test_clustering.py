@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import DBSCAN
+from sklearn.metrics import adjusted_rand_score
+
+from clustering import cluster_wallets, standardize
+from features import CLUSTER_FEATURES
+from spark_testing import local_spark, requires_java
+
+
+@requires_java
+class ExactClusteringTest(unittest.TestCase):
+    def test_labels_match_dbscan_and_nothing_stays_cached(self):
+        spark = local_spark()
+        rng = np.random.default_rng(0)
+        centres = rng.normal(0, 3, size=(4, len(CLUSTER_FEATURES)))
+        points = np.concatenate([centre + rng.normal(0, 0.3, size=(60, len(CLUSTER_FEATURES))) for centre in centres]
+                                + [rng.uniform(-8, 8, size=(40, len(CLUSTER_FEATURES)))])
+        features = pd.DataFrame(points, columns=list(CLUSTER_FEATURES))
+        features.insert(0, "SENDER_WALLET", [f"w{index}" for index in range(len(points))])
+        features = spark.createDataFrame(features)
+
+        labels = cluster_wallets(features, eps=0.5, min_samples=5, block_size=2, partitions=2).toPandas()
+        self.assertTrue(spark._jsparkSession.sharedState().cacheManager().isEmpty())
+
+        driver = standardize(features).toPandas()
+        driver["expected"] = DBSCAN(eps=0.5, min_samples=5).fit_predict(driver[list(CLUSTER_FEATURES)].values)
+        merged = driver.merge(labels, on="SENDER_WALLET")
+        self.assertEqual(len(merged), len(points))
+        self.assertEqual(adjusted_rand_score(merged["expected"], merged["cluster"]), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,17 @@
+import unittest
+
+from components import union_find
+
+
+class UnionFindTest(unittest.TestCase):
+    def test_chains_of_pairs_share_a_root(self):
+        roots = union_find([("a", "b"), ("c", "d"), ("b", "c"), ("x", "y"), ("z", "z")])
+        self.assertEqual(len({roots[node] for node in "abcd"}), 1)
+        self.assertEqual(roots["x"], roots["y"])
+        self.assertNotEqual(roots["a"], roots["x"])
+        self.assertEqual(roots["z"], "z")
+        self.assertEqual(set(roots), set("abcdxyz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from engines import TABLE_KEYS, TABLES, PandasEngine, SparkEngine
+from features import BURST_THRESHOLD
+from spark_testing import requires_java
+from synthetic import write_csv
+from timing import SYBIL_PROJECTS
+
+ROWS = 4_000
+
+
+def setUpModule():
+    global directory, csv_path
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, "transactions.csv")
+    write_csv(csv_path, ROWS, wallets=60, days=3, burst_wallets=2, burst_size=(101, 130), seed=1)
+    PandasEngine(chunk_rows=1_000).run(csv_path, os.path.join(directory, "pandas"))
+
+
+def tearDownModule():
+    shutil.rmtree(directory)
+
+
+def read_table(engine, table):
+    df = pd.read_parquet(os.path.join(directory, engine, table))
+    for name, column in df.items():
+        if pd.api.types.is_datetime64_any_dtype(column):
+            df[name] = column.astype("datetime64[ns]")
+        elif pd.api.types.is_numeric_dtype(column):
+            df[name] = column.astype("float64")
+    return df.sort_values(TABLE_KEYS[table]).reset_index(drop=True)
+
+
+class PandasEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.transactions = pd.read_csv(csv_path, parse_dates=["SOURCE_TIMESTAMP_UTC"])
+
+    def test_features_and_bursts(self):
+        features = read_table("pandas", "features")
+        self.assertEqual(features["total_transactions"].sum(), ROWS)
+        minute = self.transactions["SOURCE_TIMESTAMP_UTC"].dt.floor("min")
+        counts = self.transactions.groupby(["SENDER_WALLET", minute]).size()
+        bursts = counts[counts > BURST_THRESHOLD]
+        self.assertEqual(len(bursts), 2)
+        self.assertEqual(read_table("pandas", "bursts")["count"].tolist(), bursts.sort_index(level=1).tolist())
+
+    def test_timing_matches_sorted_gaps(self):
+        on_projects = self.transactions[self.transactions["PROJECT"].str.lower().isin(SYBIL_PROJECTS)]
+        timing = read_table("pandas", "timing").set_index(TABLE_KEYS["timing"])
+        self.assertEqual(timing["transactions"].sum(), len(on_projects))
+        for (project, wallet), rows in on_projects.groupby(TABLE_KEYS["timing"]):
+            gaps = np.diff(np.sort(rows["SOURCE_TIMESTAMP_UTC"].to_numpy())).astype("timedelta64[s]").astype(int)
+            stats = timing.loc[(project, wallet)]
+            self.assertEqual(stats["gaps"], len(gaps))
+            if len(gaps):
+                self.assertAlmostEqual(stats["mean_gap"], gaps.mean())
+                self.assertEqual((stats["min_gap"], stats["max_gap"]), (gaps.min(), gaps.max()))
+
+
+@requires_java
+class SparkEngineTest(unittest.TestCase):
+    def test_tables_match_the_pandas_engine(self):
+        SparkEngine(master="local[1]", memory="1g", partitions=2).run(csv_path, os.path.join(directory, "spark"))
+        for table in TABLES:
+            with self.subTest(table=table):
+                pd.testing.assert_frame_equal(read_table("spark", table), read_table("pandas", table))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+import pyspark.sql.functions as F
+
+from ingest import filter_period, ingest, read_csv
+from spark_testing import local_spark, requires_java
+from synthetic import write_csv
+
+
+@requires_java
+class IngestTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.spark = local_spark()
+        cls.directory = tempfile.mkdtemp()
+        cls.csv_path = os.path.join(cls.directory, "transactions.csv")
+        write_csv(cls.csv_path, 3_000, wallets=50, days=70, burst_wallets=0, seed=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_parquet_copy_holds_the_csv_rows(self):
+        parquet = ingest(self.spark, self.csv_path, os.path.join(self.directory, "monthly"))
+        csv = read_csv(self.spark, self.csv_path)
+        self.assertEqual(parquet.select(*csv.columns).exceptAll(csv).count(), 0)
+        self.assertEqual(parquet.count(), 3_000)
+        months = {row.SOURCE_DATE.isoformat() for row in parquet.select("SOURCE_DATE").distinct().collect()}
+        self.assertEqual(months, {"2023-11-01", "2023-12-01", "2024-01-01"})
+
+    def test_period_filter_prunes_partitions(self):
+        parquet = ingest(self.spark, self.csv_path, os.path.join(self.directory, "daily"), granularity="day")
+        start, end = datetime(2023, 12, 3, 12), datetime(2023, 12, 10)
+        period = filter_period(parquet, start, end)
+        timestamps = F.col("SOURCE_TIMESTAMP_UTC")
+        expected = read_csv(self.spark, self.csv_path).filter((timestamps >= start) & (timestamps < end))
+        self.assertEqual(period.count(), expected.count())
+        plan = period._jdf.queryExecution().executedPlan().toString()
+        self.assertRegex(plan, r"PartitionFilters: \[[^\]]*SOURCE_DATE")
+
+
+if __name__ == "__main__":
+    unittest.main()
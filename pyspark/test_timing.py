@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timedelta
+
+from spark_testing import local_spark, requires_java
+from timing import coordinated_groups, inter_arrivals, oversized_buckets, similar_wallets, timing_stats
+
+
+def transactions(spark):
+    start = datetime(2024, 1, 1, 22)
+    rows = []
+    # Wallet a spans several days, with gaps across midnight and days without activity.
+    for minutes in (0, 5, 5, 90, 150, 1500, 4400, 4401, 4460):
+        rows.append(("Merkly", "a", start + timedelta(minutes=minutes)))
+    rows += [("L2Pass", "a", start + timedelta(hours=hours)) for hours in (1, 30, 31)]
+    rows += [("Merkly", "a", None), ("Merkly", "a", None)]
+    rows += [("merkly", "b", start + timedelta(hours=hours)) for hours in (0, 3, 27, 50)]
+    rows += [("Merkly", "c", start), ("Merkly", "c", None), ("Stargate", "c", start)]
+    return spark.createDataFrame(rows, "PROJECT string, SENDER_WALLET string, SOURCE_TIMESTAMP_UTC timestamp")
+
+
+@requires_java
+class SaltedInterArrivalsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.spark = local_spark()
+        cls.df = transactions(cls.spark)
+
+    def stats(self, heavy):
+        gaps = inter_arrivals(self.df, partitions=2, heavy=heavy, salts=4)
+        return sorted(timing_stats(gaps).collect())
+
+    def test_salting_heavy_wallets_gives_the_same_stats(self):
+        plain = self.stats(None)
+        self.assertEqual(len(plain), 4)
+        self.assertEqual(self.stats({"a", "c"}), plain)
+        self.assertEqual(self.stats({"a", "b", "c", "missing"}), plain)
+
+    def test_every_transaction_keeps_its_row(self):
+        gaps = inter_arrivals(self.df, partitions=2, heavy={"a", "c"}, salts=4)
+        counts = {row.SENDER_WALLET: row["count"] for row in gaps.groupBy("SENDER_WALLET").count().collect()}
+        self.assertEqual(counts, {"a": 14, "b": 4, "c": 2})
+
+
+@requires_java
+class OversizedBucketsTest(unittest.TestCase):
+    def test_busy_band_values_become_oversized_groups(self):
+        spark = local_spark()
+        # Five wallets agree everywhere, two more only in the first band, and one agrees with nobody.
+        rows = [(f"busy{index}", 10, 1, 2, 3, 4) for index in range(5)]
+        rows += [("ring0", 10, 7, 8, 5, 6), ("ring1", 10, 7, 8, 9, 9), ("alone", 10, 0, 0, 0, 0)]
+        signatures = spark.createDataFrame(
+            rows, "SENDER_WALLET string, buckets long, h0 long, h1 long, h2 long, h3 long")
+        options = {"bands": 2, "max_band_wallets": 3}
+        pairs = similar_wallets(signatures, threshold=0.5, **options)
+        groups = coordinated_groups(pairs, oversized_buckets(signatures, **options)).collect()
+
+        linked = {row.SENDER_WALLET for row in groups if not row.oversized}
+        self.assertEqual(linked, {"ring0", "ring1"})
+        oversized = {}
+        for row in groups:
+            if row.oversized:
+                oversized.setdefault(row.group, set()).add(row.SENDER_WALLET)
+        # One group for each of the two bands the busy wallets share.
+        self.assertEqual(list(oversized.values()), [{f"busy{index}" for index in range(5)}] * 2)
+        self.assertEqual(len({row.group for row in groups}), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
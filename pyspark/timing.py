@@ -0,0 +1,160 @@
+"""Inter-arrival statistics and timing signatures per wallet, without collecting lists."""
+import pyspark.sql.functions as F
+from pyspark.sql.window import Window
+
+from components import union_find
+from session import default_partitions
+from skew import SALTS, salt
+
+SYBIL_PROJECTS = ("merkly", "l2pass")
+QUANTILES = (0.1, 0.5, 0.9)
+# Fewer gaps than this always look regular, so they get no periodicity.
+MIN_GAPS = 3
+NUM_HASHES = 32
+BANDS = 8
+BUCKET_MINUTES = 10
+# Wallets active in fewer buckets have signatures too coarse to compare.
+MIN_BUCKETS = 5
+# A band value shared by more wallets than this is a busy hour, not a ring of bots;
+# its wallets are reported as one oversized group instead of compared pairwise.
+MAX_BAND_WALLETS = 1_000
+SIMILARITY = 0.5
+
+
+def inter_arrivals(df, projects=SYBIL_PROJECTS, partitions=None, heavy=None, salts=SALTS):
+    """Transactions on `projects` with time_diff, the seconds since the wallet's previous one on that PROJECT."""
+    if projects:
+        # PROJECT holds display names such as "Merkly", so compare case-insensitively.
+        df = df.filter(F.lower("PROJECT").isin([project.lower() for project in projects]))
+    partitions = partitions or default_partitions(df.sparkSession)
+    df = df.select("PROJECT", "SENDER_WALLET", "SOURCE_TIMESTAMP_UTC")
+    if heavy:
+        return _split_inter_arrivals(df, partitions, heavy, salts)
+    return _inter_arrivals(df, partitions)
+
+
+def _inter_arrivals(df, partitions):
+    # The lag window, timing_stats() and timing_signatures() all group within this one shuffle.
+    df = df.repartition(partitions, "SENDER_WALLET")
+    window_spec = Window.partitionBy("SENDER_WALLET", "PROJECT").orderBy("SOURCE_TIMESTAMP_UTC")
+    return df.select("PROJECT", "SENDER_WALLET", "SOURCE_TIMESTAMP_UTC",
+                     _seconds_since(F.lag("SOURCE_TIMESTAMP_UTC").over(window_spec)).alias("time_diff"))
+
+
+def _seconds_since(previous, timestamp="SOURCE_TIMESTAMP_UTC"):
+    return F.unix_timestamp(timestamp) - F.unix_timestamp(previous)
+
+
+def _split_inter_arrivals(df, partitions, heavy, salts):
+    is_heavy = F.col("SENDER_WALLET").isin(sorted(heavy))
+    light = _inter_arrivals(df.filter(~is_heavy), partitions)
+    df = df.filter(is_heavy)
+    # Rows without a timestamp have no day; like in the plain path they get no gap.
+    undated = df.filter(F.col("SOURCE_TIMESTAMP_UTC").isNull()) \
+        .withColumn("time_diff", F.lit(None).cast("long"))
+    day = F.to_date("SOURCE_TIMESTAMP_UTC")
+    df = df.filter(F.col("SOURCE_TIMESTAMP_UTC").isNotNull()).withColumn("day", day) \
+        .withColumn("salt", salt(heavy, F.col("day"), salts)).repartition(partitions, "SENDER_WALLET", "salt")
+    within_day = Window.partitionBy("SENDER_WALLET", "PROJECT", "salt", "day").orderBy("SOURCE_TIMESTAMP_UTC")
+    later = df.select("PROJECT", "SENDER_WALLET", "SOURCE_TIMESTAMP_UTC",
+                      _seconds_since(F.lag("SOURCE_TIMESTAMP_UTC").over(within_day)).alias("time_diff")) \
+        .filter(F.col("time_diff").isNotNull())
+    days = df.groupBy("SENDER_WALLET", "PROJECT", "salt", "day").agg(
+        F.min("SOURCE_TIMESTAMP_UTC").alias("first"), F.max("SOURCE_TIMESTAMP_UTC").alias("last"))
+    # Each day's first gap comes from the previous active day's last transaction.
+    day_order = Window.partitionBy("SENDER_WALLET", "PROJECT").orderBy("day")
+    first = days.select("PROJECT", "SENDER_WALLET", F.col("first").alias("SOURCE_TIMESTAMP_UTC"),
+                        _seconds_since(F.lag("last").over(day_order)).alias("time_diff"))
+    return light.unionByName(later).unionByName(first).unionByName(undated)
+
+
+def timing_stats(gaps, quantiles=QUANTILES, accuracy=10_000, min_gaps=MIN_GAPS):
+    """Gap statistics per PROJECT and SENDER_WALLET from inter_arrivals()."""
+    # Running totals and a fixed-size quantile sketch instead of collect_list, however many gaps a wallet has.
+    names = [f"p{round(quantile * 100)}_gap" for quantile in quantiles]
+    stats = gaps.groupBy("PROJECT", "SENDER_WALLET").agg(
+        F.count("*").alias("transactions"),
+        F.count("time_diff").alias("gaps"),
+        F.avg("time_diff").alias("mean_gap"),
+        F.var_pop("time_diff").alias("var_gap"),
+        F.min("time_diff").alias("min_gap"),
+        F.max("time_diff").alias("max_gap"),
+        F.percentile_approx("time_diff", list(quantiles), accuracy).alias("quantiles"),
+    )
+    # periodicity is 1 for a wallet firing at a fixed interval, 0 once the gaps vary as much as they are long.
+    variation = F.sqrt("var_gap") / F.col("mean_gap")
+    return stats.select(
+        "PROJECT", "SENDER_WALLET", "transactions", "gaps", "mean_gap", "var_gap", "min_gap", "max_gap",
+        *[F.col("quantiles")[index].alias(name) for index, name in enumerate(names)],
+        F.when((F.col("gaps") >= min_gaps) & (F.col("mean_gap") > 0), 1 - F.least(variation, F.lit(1.0)))
+        .alias("periodicity"),
+    )
+
+
+def timing_signatures(transactions, num_hashes=NUM_HASHES, bucket_minutes=BUCKET_MINUTES):
+    """One row per wallet: its MinHash columns h0, h1, ... and how many buckets it was active in."""
+    bucket = F.floor(F.unix_timestamp("SOURCE_TIMESTAMP_UTC") / (60 * bucket_minutes))
+    return transactions.groupBy("SENDER_WALLET").agg(
+        F.approx_count_distinct(F.xxhash64("PROJECT", bucket)).alias("buckets"),
+        *[F.min(F.xxhash64(F.lit(index), "PROJECT", bucket)).alias(f"h{index}") for index in range(num_hashes)],
+    )
+
+
+def similar_wallets(signatures, bands=BANDS, threshold=SIMILARITY, min_buckets=MIN_BUCKETS,
+                    max_band_wallets=MAX_BAND_WALLETS):
+    """Pairs of wallets (wallet_a < wallet_b) whose signatures agree in at least `threshold` of their hashes."""
+    # Only wallets with an equal band are compared, so this is an equi-join rather than a cross join.
+    hashes = _hashes(signatures)
+    signatures = signatures.filter(F.col("buckets") >= min_buckets)
+    banded = _band_buckets(signatures, hashes, bands).filter(F.col("wallets").between(2, max_band_wallets))
+    candidates = banded.select(F.col("SENDER_WALLET").alias("wallet_a"), "band", "key") \
+        .join(banded.select(F.col("SENDER_WALLET").alias("wallet_b"), "band", "key"), ["band", "key"]) \
+        .filter(F.col("wallet_a") < F.col("wallet_b")) \
+        .select("wallet_a", "wallet_b").distinct()
+
+    left = signatures.select(F.col("SENDER_WALLET").alias("wallet_a"), *[F.col(name).alias(f"a_{name}")
+                                                                         for name in hashes])
+    right = signatures.select(F.col("SENDER_WALLET").alias("wallet_b"), *[F.col(name).alias(f"b_{name}")
+                                                                          for name in hashes])
+    agreement = sum((F.col(f"a_{name}") == F.col(f"b_{name}")).cast("int") for name in hashes) / len(hashes)
+    return candidates.join(left, "wallet_a").join(right, "wallet_b") \
+        .select("wallet_a", "wallet_b", agreement.alias("similarity")) \
+        .filter(F.col("similarity") >= threshold)
+
+
+def oversized_buckets(signatures, bands=BANDS, min_buckets=MIN_BUCKETS, max_band_wallets=MAX_BAND_WALLETS):
+    """SENDER_WALLET, band, key and wallets for every wallet in a band value shared by over `max_band_wallets`."""
+    signatures = signatures.filter(F.col("buckets") >= min_buckets)
+    return _band_buckets(signatures, _hashes(signatures), bands).filter(F.col("wallets") > max_band_wallets)
+
+
+def _hashes(signatures):
+    return [name for name in signatures.columns if name.startswith("h") and name[1:].isdigit()]
+
+
+def _band_buckets(signatures, hashes, bands):
+    rows = len(hashes) // bands
+    banded = signatures.select("SENDER_WALLET", F.explode(F.array(*[
+        F.struct(F.lit(band).alias("band"), F.xxhash64(*hashes[band * rows:(band + 1) * rows]).alias("key"))
+        for band in range(bands)
+    ])).alias("band"))
+    return banded.select("SENDER_WALLET", "band.band", "band.key") \
+        .withColumn("wallets", F.count("*").over(Window.partitionBy("band", "key")))
+
+
+def coordinated_groups(pairs, oversized=None):
+    """SENDER_WALLET, group and oversized for every wallet in `pairs`, grouping wallets linked by any chain of pairs."""
+    edges = pairs.select("wallet_a", "wallet_b").toLocalIterator()
+    roots = union_find((row.wallet_a, row.wallet_b) for row in edges)
+    names = {}
+    groups = [(wallet, names.setdefault(root, len(names)), False) for wallet, root in roots.items()]
+    spark = pairs.sparkSession
+    groups = spark.createDataFrame(groups, "SENDER_WALLET string, group long, oversized boolean")
+    if oversized is None:
+        return groups
+    # Each oversized bucket is a group of its own; it holds over MAX_BAND_WALLETS wallets, so there are few.
+    buckets = oversized.select("band", "key").distinct().orderBy("band", "key").collect()
+    numbers = spark.createDataFrame([(row.band, row.key, len(names) + index) for index, row in enumerate(buckets)],
+                                    "band int, key long, group long")
+    return groups.unionByName(oversized.join(F.broadcast(numbers), ["band", "key"])
+                              .select("SENDER_WALLET", "group", F.lit(True).alias("oversized")))